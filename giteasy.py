@@ -9,24 +9,47 @@ import argparse
 import argcomplete
 
 
+_current_branch = None  # cached name of the checked-out branch
+
+
 def retrieve_branch():
-    proc = subprocess.Popen(['git', 'branch'], stdout=subprocess.PIPE)
-    for line in proc.stdout:
-        if '*' in line:
-            return line.split()[1]
+    r"""Name of the checked-out branch. Git is queried only once"""
+    global _current_branch
+    if _current_branch is None:
+        try:
+            output = subprocess.check_output(
+                ['git', 'symbolic-ref', '--short', 'HEAD'],
+                stderr=subprocess.STDOUT)
+            _current_branch = output.decode().strip()
+        except subprocess.CalledProcessError:  # detached HEAD
+            output = subprocess.check_output(['git', 'branch']).decode()
+            for line in output.splitlines():
+                if line.startswith('*'):
+                    _current_branch = line.split()[1]
+                    break
+    return _current_branch
+
+
+# Suggestions for errors in the output of the Git commands
+hints = [(r"error: The branch.*is not fully merged[.\n]*If"
+          r" you are sure you want to delete it",
+          "Checkout again to the branch you want do delete, and"
+          " this time include flag --force")]
+# Alternation of all hint patterns. Named group "h<i>" matches hint "i"
+hints_pattern = re.compile('|'.join('(?P<h{}>{})'.format(i, pattern)
+                                    for i, (pattern, _) in enumerate(hints)))
 
 
 def suggest_action(error_message):
     r"""Suggest corrective action based on the output after running
     the Git commands"""
-    current_branch = retrieve_branch()
-    error_pattern = r"error: The branch.*is not fully merged[.\n]*If" \
-                    r" you are sure you want to delete it"
-    suggestion = "Checkout again to the branch you want do delete, and" \
-                 " this time include flag --force"
     buffer = "TAKE ACTION: "
-    if re.search(error_pattern, error_message):
-        print(buffer + "You are in the "+current_branch+" branch. "+suggestion)
+    match = hints_pattern.search(error_message)  # single pass over output
+    if match is not None:
+        suggestion = hints[int(match.lastgroup[1:])][1]
+        current_branch = retrieve_branch()
+        print(buffer + "You are in the " + current_branch + " branch. " +
+              suggestion)
 
 
 parser = argparse.ArgumentParser(description='Git commands for Mantid')
@@ -52,14 +75,24 @@ args = parser.parse_args()
 script = """#!/bin/bash
 # COMMANDS to run
 """
+fetched = False  # fetch from origin only once, even if several flags need it
+
+
+def fetch():
+    r"""Command to fetch from origin, or nothing if already fetched"""
+    global fetched
+    if fetched:
+        return ""
+    fetched = True
+    return "git fetch -p\n"
+
 
 if args.create:
     branch = args.create
     script += """git checkout master
-git fetch -p
-git branch --no-track {0} origin/master
-git checkout {0}
-""".format(branch)
+{0}git branch --no-track {1} origin/master
+git checkout {1}
+""".format(fetch(), branch)
 
 if args.pushToOrigin:
     branch = retrieve_branch()
@@ -67,11 +100,12 @@ if args.pushToOrigin:
         branch = "+" + branch
     if not branch or 'master' in branch:
         raise IOError("branch not retrieved")
-    script += """git push origin {0}""".format(branch)
+    script += """git push origin {0}
+""".format(branch)
 
 if args.update:
-    script += """git fetch -p
-git rebase -v origin/master"""
+    script += """{0}git rebase -v origin/master
+""".format(fetch())
 
 if args.delete:
     branch = retrieve_branch()
@@ -82,17 +116,20 @@ git branch -D {0}
 if args.updateMaster:
     branch = retrieve_branch()
     if branch == 'master':
-        script += """git fetch -p
-git pull --rebase
-"""
+        script += """{0}git pull --rebase
+""".format(fetch())
 
 print(script)  # inform of the commands to be run
 output = None  # collect output from the commands
 if not args.dryrun:
+    # a single bash process runs all commands, stopping at the first error
     try:
-        output = subprocess.check_output(script, shell=True,
+        output = subprocess.check_output(['bash', '-e', '-c', script],
                                          stderr=subprocess.STDOUT)
     except subprocess.CalledProcessError as errorObject:
         output = errorObject.output
+    output = output.decode()
     print("OUTPUT from the commands\n"+output)
+    # the commands may have checked out another branch
+    _current_branch = None
     suggest_action(output)
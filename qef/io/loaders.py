@@ -2,10 +2,15 @@ from __future__ import (absolute_import, division, print_function)
 
 import re
 import os
+from itertools import islice
 import numpy as np
 import h5py
 import logging
 
+_integer_entry = re.compile(r'(\d+)')  # DAVE integer entry
+# DAVE float entry (also scientific mode)
+_float_entry = re.compile(r'(\-*\d+\.*\d*e*\-*\d*)')
+
 
 def search_attribute(handle, name, ignore_case=False):
     r"""Find HDF5 entries containing a particular attribute
@@ -18,20 +23,27 @@ def search_attribute(handle, name, ignore_case=False):
     name : str
         Regular expression pattern to search in attributes' names
 
+    ignore_case : bool
+        Case-insensitive search of the pattern
+
     Returns
     -------
     list
         All entries with a matching attribute name. Each entry of the form
         (HDF5-instance, (attribute-key, attribute-vale))
     """
-    ic = re.IGNORECASE if ignore_case else 0
+    pattern = re.compile(name, flags=re.IGNORECASE if ignore_case else 0)
     matches = list()
-    for k in handle.attrs.keys():
-        if re.search(name, k, flags=ignore_case):
-            matches.append((handle, (k, handle.attrs[k])))
+
+    def collect(obj):
+        for k in obj.attrs.keys():
+            if pattern.search(k):
+                matches.append((obj, (k, obj.attrs[k])))
+
+    collect(handle)
     if isinstance(handle, h5py.Group):
-        for i in handle:
-            matches.extend(search_attribute(handle[i], name, ignore_case=ic))
+        # visit all descendants without recursing in python
+        handle.visititems(lambda _, obj: collect(obj))
     return matches
 
 
@@ -48,43 +60,83 @@ def histogram_to_point_data(values):
     :class:`~numpy:numpy.ndarray`
         Array with point data
     """
-    if values.ndim == 1:
-        return (values[1:] + values[:-1]) / 2.0
-    else:
-        return (values[::, 1:] + values[::, :-1]) / 2.0
+    # Sum bin boundaries into a single output array, then halve in place
+    points = np.add(values[..., 1:], values[..., :-1],
+                    dtype=np.result_type(values, 0.5))
+    points *= 0.5
+    return points
 
 
-def load_nexus_processed(file_name):
-    r"""Load data from a Mantid Nexus processed file
+def read_dataset(dataset):
+    r"""Read the contents of an HDF5 dataset into a new array
+
+    Parameters
+    ----------
+    dataset : :class:`~h5py.Dataset`
+        Dataset to read
+
+    Returns
+    -------
+    :class:`~numpy:numpy.ndarray`
+        Array with the same shape and type as the dataset
+    """
+    values = np.empty(dataset.shape, dtype=dataset.dtype)
+    if values.size > 0:
+        dataset.read_direct(values)
+    return values
+
+
+def open_hdf5(file_name):
+    r"""Open an HDF5 file in read-only mode
+
+    The chunk cache is enlarged so that it is shared among sibling datasets
 
     Parameters
     ----------
     file_name : str
         Path to file
 
+    Returns
+    -------
+    :class:`~h5py.File`
+    """
+    return h5py.File(file_name, 'r', rdcc_nbytes=16 * 1024 ** 2,
+                     rdcc_nslots=10007)
+
+
+def load_nexus_processed(file_name):
+    r"""Load data from a Mantid Nexus processed file
+
+    Parameters
+    ----------
+    file_name : str or :class:`~h5py.File`
+        Path to file, or handle to the already opened file
+
     Returns
     -------
     dict
         keys are q(momentum transfer), x(energy or time), y(intensities), and
         errors(e)
     """
-    with h5py.File(file_name) as f:
-        data = f['mantid_workspace_1']
-        w = data['workspace']
-        x = w['axis1'].value  # energy or time values
-        y = w['values'].value  # intensities
-        e = w['errors'].value  # undeterminacies in the intensities
-        # Transform to point data
-        if len(x) == 1 + len(y[0]):
-            x = histogram_to_point_data(x)
-        # Obtain the momentum transfer values
-        q = w['axis2'].value
-        if w['axis2'].attrs['units'] != 'MomentumTransfer':
-            logging.warning('Units of vertical axis is not MomentumTransfer')
-        # Transform Q values to point data
-        if len(q) == 1 + len(y):
-            q = histogram_to_point_data(q)
-        return dict(q=q, x=x, y=y, e=e)
+    if not isinstance(file_name, h5py.File):
+        with open_hdf5(file_name) as f:
+            return load_nexus_processed(f)
+    data = file_name['mantid_workspace_1']
+    w = data['workspace']
+    x = read_dataset(w['axis1'])  # energy or time values
+    y = read_dataset(w['values'])  # intensities
+    e = read_dataset(w['errors'])  # undeterminacies in the intensities
+    # Transform to point data
+    if len(x) == 1 + len(y[0]):
+        x = histogram_to_point_data(x)
+    # Obtain the momentum transfer values
+    q = read_dataset(w['axis2'])
+    if w['axis2'].attrs['units'] != 'MomentumTransfer':
+        logging.warning('Units of vertical axis is not MomentumTransfer')
+    # Transform Q values to point data
+    if len(q) == 1 + len(y):
+        q = histogram_to_point_data(q)
+    return dict(q=q, x=x, y=y, e=e)
 
 
 def load_nexus(file_name):
@@ -104,10 +156,10 @@ def load_nexus(file_name):
     _, extension = os.path.splitext(file_name)
     if extension != '.nxs':
         raise IOError('File extension is not .nxs')
-    # Validate content
-    with h5py.File(file_name) as f:
-        if 'mantid_workspace_1' in f.keys():
-            data = load_nexus_processed(file_name)
+    # Validate content, then read from the same file handle
+    with open_hdf5(file_name) as f:
+        if 'mantid_workspace_1' in f:
+            data = load_nexus_processed(f)
         else:
             raise IOError('No reader found for this HDF5 file')
     return data
@@ -145,22 +197,18 @@ def load_dave(file_name, to_meV=True):
 
     # Load number of energies and Q values
     def load_number_of_items(key):
-        pattern = re.compile(r'(\d+)')
         # starting position for search
         start = all.find(entries[key]) + len(entries[key])
-        return int(pattern.search(all[start:]).group(1))
+        return int(_integer_entry.search(all, start).group(1))
 
     n_e = load_number_of_items('n_e')  # number of energy values
     n_q = load_number_of_items('n_q')  # number of Q values
 
     # Load energies and Q values
-    fexpr = r'(\-*\d+\.*\d*e*\-*\d*)'  # float entry (also scientific mode)
-
     def load_items(n, key):
-        pattern = re.compile(fexpr)
         start = all.find(entries[key]) + len(entries[key])
-        matches = pattern.finditer(all[start:])
-        return np.asarray([float(m.group(1)) for m in matches][: n])
+        matches = islice(_float_entry.finditer(all, start), n)
+        return np.asarray([float(m.group(1)) for m in matches])
 
     x = load_items(n_e, 'e')  # energy values
     if to_meV:
@@ -168,17 +216,19 @@ def load_dave(file_name, to_meV=True):
     q = load_items(n_q, 'q')  # Q values
 
     # Load intensities
-    y = list()
-    e = list()
-    pattern = re.compile(fexpr)
+    y = np.empty((n_q, n_e), dtype=np.float64)
+    e = np.empty_like(y)
+    cursor = 0  # groups are stored in order, no need to scan earlier content
     for i in range(n_q):
         entry = entries['g'] + ' {}'.format(i)
-        # starting position to search Group "i"
-        start = all.find(entry) + len(entry)
-        matches = pattern.finditer(all[start:])
-        # ye contains both intensities and errors
-        ye = np.asarray([float(m.group(1)) for m in matches][: 2 * n_e])
-        y.append(list(ye[::2]))  # every other item in the list
-        e.append(list(ye[1::2]))  # shift one, and then every other item
-
-    return dict(q=q, x=x, y=np.asarray(y), e=np.asarray(e))
+        # Group "i" spans from its header to the next comment, or to EOF
+        start = all.find(entry, cursor) + len(entry)
+        end = all.find(comment_symbol, start)
+        cursor = len(all) if end < 0 else end
+        block = all[start: cursor]
+        # ye contains both intensities and errors, one pair per line
+        ye = np.fromstring(block, sep=' ')[: 2 * n_e].reshape(n_e, 2)
+        y[i] = ye[:, 0]
+        e[i] = ye[:, 1]
+
+    return dict(q=q, x=x, y=y, e=e)
@@ -3,7 +3,7 @@ from __future__ import (absolute_import, division, print_function)
 from distutils.version import LooseVersion as version
 import numpy as np
 import lmfit
-from lmfit.models import (Model, index_of)
+from lmfit.models import Model
 
 
 def delta_dirac(x, amplitude=1.0, center=0.0):
@@ -21,9 +21,23 @@ def delta_dirac(x, amplitude=1.0, center=0.0):
     center : float
         position of the peak
     """
-    dx = (x[-1] - x[0]) / (len(x) - 1)  # domain spacing
-    y = np.zeros(len(x))
-    y[np.abs(x - center).argmin()] = amplitude / dx
+    n = len(x)
+    dx = (x[-1] - x[0]) / (n - 1)  # domain spacing
+    i = None
+    if np.isfinite(center):
+        # Index closest to center, exact for a grid of equispaced values.
+        # Clipped before the integer conversion, as very large centers
+        # overflow
+        with np.errstate(over='ignore'):
+            i = int(round(np.clip((center - x[0]) / dx, 0, n - 1)))
+        d = abs(x[i] - center)
+        if (i > 0 and abs(x[i - 1] - center) < d) or\
+                (i < n - 1 and abs(x[i + 1] - center) < d):
+            i = None  # grid not equispaced
+    if i is None:
+        i = np.abs(x - center).argmin()
+    y = np.zeros(n)
+    y[i] = amplitude / dx
     return y
 
 
@@ -66,10 +80,11 @@ class DeltaDiracModel(Model):
         :class:`~lmfit.parameter.Parameters`
             parameters with guessed values
         """
-        amplitude = max(y)
+        i_max = int(np.argmax(y))  # single pass over the intensities
+        amplitude = y[i_max]
         center = 0.0
         if x is not None:
-            center = x[index_of(y, max(y))]
+            center = x[i_max]
             dx = (x[-1] - x[0]) / (len(x) - 1)  # x-spacing
             amplitude /= dx
         return self.make_params(amplitude=amplitude, center=center)
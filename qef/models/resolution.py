@@ -13,6 +13,10 @@ class TabulatedResolutionModel(TabulatedModel):
 
     ys: :class:`~numpy:numpy.ndarray`
         given domain of the function, intensity
+
+    copy: bool
+        If :code:`False`, share the table with the caller instead of
+        keeping a copy. See :class:`~qef.models.tabulatedmodel.TabulatedModel`
     """
 
     def __init__(self, xs, ys, *args, **kwargs):
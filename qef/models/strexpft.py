@@ -6,7 +6,7 @@ from scipy.special import gamma
 from scipy import constants
 import numpy as np
 import lmfit
-from lmfit.models import (Model, index_of)
+from lmfit.models import Model
 
 planck_constant = constants.Planck / constants.e * 1E15  # meV*psec
 
@@ -134,12 +134,13 @@ class StretchedExponentialFTModel(Model):
         tau = 10.0
         beta = 1.0
         if x is not None:
-            center = x[index_of(y, max(y))]  # assumed peak within domain x
+            i_max = int(np.argmax(y))  # single pass over the intensities
+            center = x[i_max]  # assumed peak within domain x
             # Assumptions:
             #   1. large dynamic range, function decays fast in domain x
             #   2. x-values are equispaced
             amplitude = sum(y) * (max(x)-min(x))/len(x)
-            tau = max(y) / amplitude  # assumed beta==1.0
+            tau = y[i_max] / amplitude  # assumed beta==1.0
         return self.make_params(amplitude=amplitude,
                                 center=center,
                                 tau=tau,
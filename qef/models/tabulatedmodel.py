@@ -1,7 +1,6 @@
 from __future__ import (absolute_import, division, print_function)
 
 import numpy as np
-from scipy.interpolate import interp1d
 from lmfit import Model, models
 
 
@@ -16,21 +15,47 @@ class TabulatedModel(Model):
         ys: :class:`~numpy:numpy.ndarray`
             given domain of the function, intensity
 
+        copy: bool
+            If :code:`True` (default), the model keeps copies of the table.
+            If :code:`False`, tables already sorted, contiguous, and in
+            double precision are used without copies, thus shared by
+            models created from the same arrays. Later in-place changes
+            of `xs` or `ys` then change the model
+
+        Attributes:
+            - ``shared_table`` is :code:`True` if the table is shared with
+              writable arrays of the caller, thus the table may change
+
         Fitting parameters:
             - rescaling factor ``amplitude``
             - shift along the X-axis ``center``
     """
 
     def __init__(self, xs, ys, *args, **kwargs):
+        copy = kwargs.pop('copy', True)
+        # Sort the table once, as required by numpy.interp
         x_1d = xs.reshape(xs.size)
         y_1d = ys.reshape(ys.size)
-        y_at_xmin = y_1d[np.argmin(x_1d)]
-        y_at_xmax = y_1d[np.argmax(x_1d)]
-        self._interp = interp1d(x_1d, y_1d, fill_value=(y_at_xmin, y_at_xmax),
-                                bounds_error=False, kind='linear')
+        unsorted = bool(np.any(x_1d[1:] < x_1d[:-1]))
+        if unsorted:
+            order = np.argsort(x_1d, kind='mergesort')
+            x_1d, y_1d = x_1d[order], y_1d[order]  # new arrays
+        copy = copy is True and not unsorted
+        as_table = np.array if copy else np.ascontiguousarray
+        self._xs = as_table(x_1d, dtype=np.float64)
+        self._ys = as_table(y_1d, dtype=np.float64)
+        self.shared_table = any(
+            a.flags.writeable and np.shares_memory(a, t)
+            for a, t in ((xs, self._xs), (ys, self._ys)))
+        # the model never modifies its table
+        self._xs.setflags(write=False)
+        self._ys.setflags(write=False)
 
         def interpolator(x, amplitude, center):
-            return amplitude * self._interp(x - center)
+            # Outside the table, numpy.interp returns the boundary values
+            y = np.interp(x - center, self._xs, self._ys)
+            y *= amplitude  # rescale in place, no extra temporary array
+            return y
 
         super(TabulatedModel, self).__init__(interpolator, *args, **kwargs)
         self.set_param_hint('amplitude', value=1.0)
@@ -62,9 +87,10 @@ class TabulatedModel(Model):
         def pset(param, value):
             params["%s%s" % (self.prefix, param)].set(value=value)
 
-        x_at_max = x[models.index_of(data, max(data))]
+        i_max = int(np.argmax(data))  # single pass over the data
+        x_at_max = x[i_max]
         ysim = self.eval(x=x_at_max, amplitude=1, center=x_at_max)
-        amplitude = max(data) / ysim
+        amplitude = data[i_max] / ysim
         pset("amplitude", amplitude)
         pset("center",  x_at_max)
         return models.update_param_vals(params, self.prefix, **kwargs)
@@ -2,18 +2,170 @@ from __future__ import (absolute_import, division, print_function)
 
 from distutils.version import LooseVersion as version
 import numpy as np
+from scipy.optimize import least_squares
 import lmfit
-from lmfit.models import (Model, LorentzianModel)
-from lmfit.lineshapes import lorentzian
+from lmfit.models import Model
+from lmfit.lineshapes import tiny
 
 from qef.constants import hbar
 from qef.models.utils import MIN_POS_DBL, prefix_params
+from qef.operators.convolve import convolve, extended_energies
 
 
 def teixeira_water(x, amplitude=1.0, center=1.0, tau=1.0, dcf=1.0, q=1.0):
     dq2 = dcf * q * q
-    hwhm = hbar * dq2 / (1 + tau * dq2)
-    return lorentzian(x, amplitude=amplitude, center=center, sigma=hwhm)
+    # same guard as lmfit's lorentzian, avoiding NaN for vanishing widths
+    hwhm = max(tiny, hbar * dq2 / (1 + tau * dq2))
+    # Lorentzian evaluated in place on a single output array
+    y = np.array(x, dtype=np.float64)
+    y -= center
+    np.square(y, out=y)
+    y += hwhm * hwhm
+    np.reciprocal(y, out=y)
+    y *= amplitude * hwhm / np.pi
+    return y
+
+
+def teixeira_water_batch(x, amplitude=1.0, center=1.0, tau=1.0, dcf=1.0,
+                         q=(1.0,)):
+    r"""Teixeira intensities for several momentum transfer values at once
+
+    Parameters
+    ----------
+    x : :class:`~numpy:numpy.ndarray`
+        domain of the function, energy
+    amplitude : float
+        Integrated intensity of the curve
+    center : float
+        position of the peak
+    tau : float
+        residence time
+    dcf : float
+        diffusion coefficient
+    q : sequence of float
+        momentum transfer values
+
+    Returns
+    -------
+    :class:`~numpy:numpy.ndarray`
+        intensities, one row for each momentum transfer value
+    """
+    q = np.asarray(q, dtype=np.float64)
+    dq2 = dcf * q * q
+    hwhm = np.maximum(tiny, hbar * dq2 / (1 + tau * dq2))[:, np.newaxis]
+    # Lorentzians evaluated in place, broadcasting over the rows
+    y = np.empty((len(q), np.size(x)))
+    np.subtract(x, center, out=y)
+    np.square(y, out=y)
+    y += hwhm * hwhm
+    np.reciprocal(y, out=y)
+    y *= amplitude * hwhm / np.pi
+    return y
+
+
+def teixeira_water_jacobian(x, amplitude=1.0, center=1.0, tau=1.0, dcf=1.0,
+                            q=1.0):
+    r"""Derivatives of the Teixeira intensities with respect to the
+    parameters amplitude, center, tau, and dcf
+
+    Parameters
+    ----------
+    x : :class:`~numpy:numpy.ndarray`
+        domain of the function, energy
+    amplitude : float
+        Integrated intensity of the curve
+    center : float
+        position of the peak
+    tau : float
+        residence time
+    dcf : float
+        diffusion coefficient
+    q : float
+        momentum transfer
+
+    Returns
+    -------
+    :class:`~numpy:numpy.ndarray`
+        array of shape (len(x), 4), one column for each parameter
+    """
+    dq2 = dcf * q * q
+    hwhm = max(tiny, hbar * dq2 / (1 + tau * dq2))
+    # derivatives of the HWHM with respect to tau and dcf
+    dh_dtau = -hbar * dq2 * dq2 / (1 + tau * dq2) ** 2
+    dh_ddcf = hbar * q * q / (1 + tau * dq2) ** 2
+    dx = np.asarray(x, dtype=np.float64) - center
+    den = dx * dx + hwhm * hwhm
+    jac = np.empty((dx.size, 4))
+    jac[:, 0] = hwhm / (np.pi * den)
+    jac[:, 1] = 2 * amplitude * hwhm * dx / (np.pi * den * den)
+    dl_dh = amplitude * (dx * dx - hwhm * hwhm) / (np.pi * den * den)
+    jac[:, 2] = dl_dh * dh_dtau
+    jac[:, 3] = dl_dh * dh_ddcf
+    return jac
+
+
+def fit_teixeira_fast(x, y, q, resolution=None, weights=None, p0=None):
+    r"""Fit the Teixeira model to one spectrum with
+    :func:`~scipy:scipy.optimize.least_squares` and the analytic Jacobian
+
+    Skips the parameter and constraint machinery of lmfit, and the
+    finite-difference estimation of the Jacobian. Amplitude, residence
+    time, and diffusion coefficient are bound to non-negative values.
+
+    Parameters
+    ----------
+    x : :class:`~numpy:numpy.ndarray`
+        energy values, sorted in increasing order
+    y : :class:`~numpy:numpy.ndarray`
+        intensities
+    q : float
+        momentum transfer
+    resolution : :class:`~numpy:numpy.ndarray`
+        resolution function evaluated at energies :code:`x`. If not
+        :code:`None`, the model and its Jacobian are convolved with the
+        resolution as in :class:`~qef.operators.convolve.Convolve`
+    weights : :class:`~numpy:numpy.ndarray`
+        weights of the residuals, usually the inverse of the errors
+    p0 : sequence
+        initial amplitude, center, tau, and dcf. Guessed if :code:`None`
+
+    Returns
+    -------
+    :class:`~scipy:scipy.optimize.OptimizeResult`
+        optimized amplitude, center, tau, and dcf are stored in
+        attribute :code:`x`
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    w = 1.0 if weights is None else np.asarray(weights, dtype=np.float64)
+    if p0 is None:
+        p = TeixeiraWaterModel(q=q).guess(y, x=x)
+        p0 = [p[name].value for name in ('amplitude', 'center', 'tau', 'dcf')]
+    e = x
+    if resolution is not None:
+        # the model is evaluated over an extended energy range to avoid
+        # boundary effects. Convolution is linear, thus the Jacobian of the
+        # convolved model is the convolution of the Jacobian
+        res = np.asarray(resolution, dtype=np.float64)
+        e, de = extended_energies(x)
+
+    def residuals(p):
+        m = teixeira_water(e, *p, q=q)
+        if resolution is not None:
+            m = de * convolve(m, res)
+        return w * (m - y)
+
+    def jacobian(p):
+        jac = teixeira_water_jacobian(e, *p, q=q)
+        if resolution is not None:
+            jac = de * np.column_stack([convolve(c, res) for c in jac.T])
+        if weights is not None:
+            jac *= w[:, np.newaxis]
+        return jac
+
+    bounds = ([0.0, -np.inf, 0.0, 0.0], [np.inf] * 4)
+    return least_squares(residuals, p0, jac=jacobian, bounds=bounds,
+                         method='trf')
 
 
 class TeixeiraWaterModel(Model):
@@ -48,41 +200,65 @@ class TeixeiraWaterModel(Model):
 
     def __init__(self, independent_vars=['x'], q=0.0, prefix='', missing=None,
                  name=None, **kwargs):
+        # q is not a fitting parameter but a fixed option, forwarded by
+        # lmfit to teixeira_water on every evaluation
         kwargs.update({'prefix': prefix, 'missing': missing, 'name': name,
-                       'independent_vars': independent_vars})
-        self.q = q
-
-        def txr(x, amplitude=1.0, center=1.0, tau=1.0, dcf=1.0):
-            r"""Teixeira intensities with a particular Q-value
-
-            Not implemented as partial(teixeira_water, q=q) because
-            inspect.getargspec faults with partial objects in python 2.7"""
-            return teixeira_water(x, amplitude=amplitude, center=center,
-                                  tau=tau, dcf=dcf, q=q)
-        super(TeixeiraWaterModel, self).__init__(txr, **kwargs)
-        [self.set_param_hint(name, min=MIN_POS_DBL) for name in
-         ('amplitude', 'tau', 'dcf')]
-        self.set_param_hint('fwhm', expr=self.fwhm_expr)
-        self.set_param_hint('height', expr=self.height_expr)
+                       'independent_vars': independent_vars,
+                       'param_names': ['amplitude', 'center', 'tau', 'dcf'],
+                       'q': q})
+        super(TeixeiraWaterModel, self).__init__(teixeira_water, **kwargs)
+        for name in self.param_names:
+            self.set_param_hint(name, value=1.0)
+        for name in ('amplitude', 'tau', 'dcf'):
+            self.set_param_hint(name, min=MIN_POS_DBL)
+        self._set_expr_hints()
 
     if version(lmfit.__version__) > version('0.9.5'):
         __init__.__doc__ = lmfit.models.COMMON_INIT_DOC
 
     @property
-    @prefix_params
+    def q(self):
+        """Momentum transfer"""
+        return self.opts['q']
+
+    @q.setter
+    def q(self, value):
+        self.opts['q'] = value
+        self._set_expr_hints()
+
+    @property
     def fwhm_expr(self):
         """Constraint expression for FWHM"""
-        dq2 = 'dcf*{q2}'.format(q2=self.q * self.q)
-        fmt = '2*{hbar}*{dq2}/(1+tau*{dq2})'
-        return fmt.format(hbar=hbar, dq2=dq2)
+        return self._fwhm_expr
 
     @property
-    @prefix_params
     def height_expr(self):
         """Constraint expression for maximum peak height."""
-        fmt = "2.0/{pi}*amplitude/fwhm"
+        return self._height_expr
+
+    @prefix_params
+    def _make_fwhm_expr(self):
+        # fold numeric factors so the constraint evaluates fewer operations
+        dq2 = 'dcf*{q2}'.format(q2=self.q * self.q)
+        fmt = '{two_hbar}*{dq2}/(1+tau*{dq2})'
+        return fmt.format(two_hbar=2 * hbar, dq2=dq2)
+
+    @prefix_params
+    def _make_height_expr(self):
+        fmt = "2.0/{pi}*amplitude/{prefix}fwhm"
         return fmt.format(pi=np.pi, prefix=self.prefix)
 
+    def _set_expr_hints(self):
+        r"""Build the constraint expressions once for the current values
+        of momentum transfer and prefix, not at every access"""
+        self._fwhm_expr = self._make_fwhm_expr()
+        self._height_expr = self._make_height_expr()
+        self.set_param_hint('fwhm', expr=self._fwhm_expr)
+        self.set_param_hint('height', expr=self._height_expr)
+
+    def _set_paramhints_prefix(self):
+        self._set_expr_hints()
+
     def guess(self, y, x=None, **kwargs):
         r"""Guess starting values for the parameters of a model.
 
@@ -105,12 +281,18 @@ class TeixeiraWaterModel(Model):
         tau = 1.0
         dcf = 1.0
         if x is not None:
-            # Use guess method from the Lorentzian model
-            p = LorentzianModel().guess(y, x)
-            center = p['center']
+            # Peak position and half width at half maximum
+            i_max = int(np.argmax(y))
+            center = x[i_max]
+            above = np.flatnonzero(y >= 0.5 * y[i_max])
+            hwhm = 0.5 * abs(x[above[-1]] - x[above[0]])
+            if hwhm == 0.0:  # peak narrower than the x-spacing
+                hwhm = 0.5 * abs(x[-1] - x[0]) / (len(x) - 1)
             # Assume diff*q*q and tau^(-1) same value
-            tau = hbar / (2 * p['sigma'])
-            dcf = 1.0 / (self.q * self.q * tau)
+            tau = hbar / (2 * hwhm)
+            q2_tau = self.q * self.q * tau
+            if q2_tau > tiny:  # otherwise dcf is undetermined, keep default
+                dcf = 1.0 / q2_tau
         return self.make_params(amplitude=amplitude,
                                 center=center,
                                 tau=tau,
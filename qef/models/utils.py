@@ -1,7 +1,10 @@
 from __future__ import (absolute_import, division, print_function)
 
+import re
 import numpy as np
+import multiprocessing
 from functools import wraps
+from scipy.cluster.vq import kmeans2
 from lmfit.model import Model
 
 MIN_POS_DBL = np.nextafter(0, 1)  # minimum positive float
@@ -26,8 +29,137 @@ def prefix_params(param_expr):
             raise TypeError('Function argument is not a Model instance')
         prefix = model_instance.prefix
         p_e = param_expr(model_instance)  # the parameter expression in str
-        for prefixed_name in model_instance.param_names:
-            name = prefixed_name.replace(prefix, '')  # drop the prefix
-            p_e = p_e.replace(name, prefixed_name)
-        return p_e
+        # Single pass over the expression. Whole words only, so that
+        # a name is not replaced within a longer name. Module re caches
+        # the compiled pattern
+        names = sorted((pn[len(prefix):] for pn in model_instance.param_names),
+                       key=len, reverse=True)
+        pattern = r'\b(' + '|'.join(map(re.escape, names)) + r')\b'
+        return re.sub(pattern, lambda m: prefix + m.group(1), p_e)
     return wrapper
+
+
+def _fit_spectra(args):
+    r"""Fit a chunk of spectra, one model per momentum transfer value"""
+    model_factory, x, chunk, fit_kws = args
+    results = list()
+    for q, y, weights, guess in chunk:
+        model, params = model_factory(q)
+        if guess is not None:
+            params = guess
+        fit = model.fit(y, params=params, weights=weights, x=x, **fit_kws)
+        results.append((fit.params, fit.redchi))
+    return results
+
+
+def fit_parallel(model_factory, x, ys, q_values, weights=None, guesses=None,
+                 n_workers=None, **fit_kws):
+    r"""Independent fits of spectra at different momentum transfer values,
+    distributed among a pool of processes
+
+    The spectra are split in as many chunks as workers, so that each
+    worker process receives a single task.
+
+    Parameters
+    ----------
+    model_factory: function
+        Module-level function taking a momentum transfer value and returning
+        a model and its initial parameters. It must be picklable because
+        models are created within the worker processes
+    x: :class:`~numpy:numpy.ndarray`
+        domain of the spectra, energy
+    ys: :class:`~numpy:numpy.ndarray`
+        spectra, one for each momentum transfer value
+    q_values: sequence
+        momentum transfer values
+    weights: :class:`~numpy:numpy.ndarray`
+        weights of the spectra for the fits, same shape as `ys`
+    guesses: sequence
+        initial :class:`~lmfit.parameter.Parameters` for each spectrum,
+        replacing those returned by `model_factory`. See
+        :func:`~qef.models.utils.warm_start_guess`
+    n_workers: int
+        number of processes. Default is the number of CPUs. Fits are
+        carried out serially in the calling process if equal to one
+    fit_kws: dict
+        additional optional arguments, passed to the fit method of the model
+
+    Returns
+    -------
+    list
+        one tuple for each spectrum, containing the optimized
+        :class:`~lmfit.parameter.Parameters` and the reduced chi-square
+    """
+    n_spectra = len(q_values)
+    if weights is None:
+        weights = [None] * n_spectra
+    if guesses is None:
+        guesses = [None] * n_spectra
+    items = list(zip(q_values, ys, weights, guesses))
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_workers = max(1, min(n_workers, n_spectra))
+    if n_workers == 1:
+        return _fit_spectra((model_factory, x, items, fit_kws))
+    chunks = [items[i::n_workers] for i in range(n_workers)]
+    pool = multiprocessing.Pool(processes=n_workers)
+    try:
+        chunk_results = pool.map(
+            _fit_spectra, [(model_factory, x, c, fit_kws) for c in chunks])
+    finally:
+        pool.close()
+        pool.join()
+    # Undo the round-robin assignment of spectra to chunks
+    results = [None] * n_spectra
+    for i, chunk_result in enumerate(chunk_results):
+        results[i::n_workers] = chunk_result
+    return results
+
+
+def warm_start_guess(model_factory, x, ys, q_values, n_clusters=8,
+                     seed=None):
+    r"""Initial parameters for many spectra from the guesses of a few
+    representative spectra
+
+    Spectra normalized by their area are grouped with k-means clustering.
+    The parameters of each spectrum are guessed from the mean of its
+    cluster, rescaled to the area of the spectrum. Mean spectra are less
+    noisy than individual spectra, leading to better starting points.
+
+    Parameters
+    ----------
+    model_factory: function
+        Function taking a momentum transfer value and returning a model
+        and its initial parameters
+    x: :class:`~numpy:numpy.ndarray`
+        domain of the spectra, energy
+    ys: :class:`~numpy:numpy.ndarray`
+        spectra, one for each momentum transfer value
+    q_values: sequence
+        momentum transfer values
+    n_clusters: int
+        number of clusters, reduced to the number of spectra if bigger
+    seed: int or :class:`~numpy:numpy.random.RandomState`
+        seed for the selection of initial cluster centers, passed to
+        :func:`~scipy:scipy.cluster.vq.kmeans2`. The global random
+        number generator of numpy is used if :code:`None`
+
+    Returns
+    -------
+    list
+        guessed :class:`~lmfit.parameter.Parameters`, one for each spectrum
+    """
+    ys = np.asarray(ys, dtype=np.float64)
+    areas = np.trapz(ys, x=x, axis=1)
+    areas[areas == 0] = 1.0
+    normalized = ys / areas[:, np.newaxis]
+    n_clusters = min(n_clusters, len(ys))
+    _, labels = kmeans2(normalized, n_clusters, minit='points',
+                        seed=seed)
+    means = {label: normalized[labels == label].mean(axis=0)
+             for label in np.unique(labels)}
+    guesses = list()
+    for q, area, label in zip(q_values, areas, labels):
+        model, _ = model_factory(q)
+        guesses.append(model.guess(area * means[label], x=x))
+    return guesses
@@ -1,4 +1,6 @@
 import numpy as np
+from scipy.signal import fftconvolve
+from scipy.fftpack import next_fast_len
 from lmfit import CompositeModel
 
 
@@ -21,12 +23,39 @@ def convolve(model, resolution):
     -------
     numpy.ndarray
     """  # noqa: E501
-    c = np.convolve(model, resolution, mode='valid')
+    # FFT-based, O(N log N) instead of the O(N*M) of numpy.convolve
+    c = fftconvolve(model, resolution, mode='valid')
     if len(model) % len(resolution) == 0:
         c = c[:-1]
     return c
 
 
+def extended_energies(e):
+    r"""Energy range extended beyond both boundaries of the input range
+
+    The extension avoids boundary effects when convolving with function
+    :func:`~qef.operators.convolve.convolve` a model evaluated over the
+    extended range with a resolution evaluated over the input range.
+
+    Parameters
+    ----------
+    e : :class:`~numpy:numpy.ndarray`
+        energy values, sorted in increasing order
+
+    Returns
+    -------
+    tuple
+        extended energy values and their spacing
+    """
+    # e is sorted, thus negative and positive energies are contiguous
+    # slices, and reversed slices are views
+    neg_e = e[0] - e[np.searchsorted(e, 0.0, side='right'):][::-1]
+    pos_e = e[-1] - e[:np.searchsorted(e, 0.0, side='left')][::-1]
+    extended = np.concatenate((neg_e, e, pos_e))
+    de = (extended[-1] - extended[0]) / (len(extended) - 1)  # spacing
+    return extended, de
+
+
 class Convolve(CompositeModel):
     r"""Convolution between model and resolution.
 
@@ -42,17 +71,127 @@ class Convolve(CompositeModel):
         super(Convolve, self).__init__(resolution, model, convolve, **kws)
         self.resolution = resolution
         self.model = model
+        self._extension = None  # last extended energy range
+        self._res_fft = None  # transform of last evaluated resolution
+        self._last_eval = None  # energies, parameter values, and result
+
+    def extended_energies(self, e):
+        r"""Energy range extended beyond both boundaries of the input range
+
+        The extension avoids boundary effects when convolving. The result
+        is cached, since a fit evaluates the model over the same energies.
+
+        Parameters
+        ----------
+        e : :class:`~numpy:numpy.ndarray`
+            energy values, sorted in increasing order
+
+        Returns
+        -------
+        tuple
+            extended energy values (read-only) and their spacing
+        """
+        cache = self._extension
+        if cache is not None and np.array_equal(cache[0], e):
+            return cache[1], cache[2]
+        extended, de = extended_energies(e)
+        extended.setflags(write=False)  # shared among evaluations
+        self._extension = (np.array(e), extended, de)
+        return extended, de
+
+    def fft_convolve(self, model_data, res_data):
+        r"""Same result as function :func:`~qef.operators.convolve.convolve`
+
+        The size of the transforms and the transform of the resolution are
+        cached, since the resolution is typically unchanged among the
+        evaluations of a fit.
+
+        Parameters
+        ----------
+        model_data : :class:`~numpy:numpy.ndarray`
+            model data
+        res_data : :class:`~numpy:numpy.ndarray`
+            resolution data, not longer than model data
+
+        Returns
+        -------
+        :class:`~numpy:numpy.ndarray`
+        """
+        n, m = len(model_data), len(res_data)
+        cache = self._res_fft
+        if cache is None or cache[1] != n or\
+                not np.array_equal(cache[0], res_data):
+            # circular convolution of size n or bigger leaves entries m-1
+            # to n-1 free of wrap-around, which are the valid entries
+            n_fft = next_fast_len(n)
+            cache = (np.array(res_data), n, n_fft,
+                     np.fft.rfft(res_data, n_fft))
+            self._res_fft = cache
+        n_fft, res_fft = cache[2], cache[3]
+        spectrum = np.fft.rfft(model_data, n_fft)
+        spectrum *= res_fft
+        c = np.fft.irfft(spectrum, n_fft)[m - 1: n]
+        if n % m == 0:
+            c = c[:-1]
+        return c
 
     def eval(self, params=None, **kwargs):
+        r"""Evaluate the convolution
+
+        The last evaluation is cached. Fits evaluating several models, one
+        for each spectrum, change the parameters of a single model at a
+        time when estimating derivatives. The remaining models reuse their
+        last evaluation. Changes in the parameter values or in the options
+        of the component models (e.g. the momentum transfer of
+        :class:`~qef.models.teixeira.TeixeiraWaterModel`) invalidate the
+        cache.
+
+        Other state of the components is not tracked. Evaluations are not
+        cached if a :class:`~qef.models.tabulatedmodel.TabulatedModel`
+        component shares its table with writable arrays (see its
+        :code:`shared_table` attribute), since the table may then change
+        in place. Components holding data changed otherwise, e.g. in
+        closures, require a new :class:`~qef.operators.convolve.Convolve`.
+
+        Parameters
+        ----------
+        params : :class:`~lmfit.parameter.Parameters`
+            parameters of the resolution and model
+        kwargs : dict
+            independent variable and overrides of parameter values
+
+        Returns
+        -------
+        :class:`~numpy:numpy.ndarray`
+            convolution, read-only since it is shared with the cache
+        """
+        independent_var = self.resolution.independent_vars[0]
+        e = np.asarray(kwargs[independent_var])  # energy values
+        # same energies return the same cached extension
+        e_ext, de = self.extended_energies(e)
+        key = None
+        if params is not None and len(kwargs) == 1 and\
+                not any(getattr(c, 'shared_table', False)
+                        for c in self.components):
+            values = tuple(params[name].value if name in params else None
+                           for name in self.param_names)
+            # copies, since options may be changed in place
+            opts = tuple(dict(c.opts) for c in self.components)
+            key = (values, opts)
+            last = self._last_eval
+            if last is not None and last[0] is e_ext:
+                try:
+                    if last[1] == key:
+                        return last[2]
+                except ValueError:  # options not comparable, e.g. arrays
+                    pass
         res_data = self.resolution.eval(params=params, **kwargs)
         # evaluate model on an extended energy range to avoid boundary effects
-        independent_var = self.resolution.independent_vars[0]
-        e = kwargs[independent_var]  # energy values
-        neg_e = min(e) - np.flip(e[np.where(e > 0)], axis=0)
-        pos_e = max(e) - np.flip(e[np.where(e < 0)], axis=0)
-        e = np.concatenate((neg_e, e, pos_e))
-        kwargs.update({independent_var: e})
+        kwargs.update({independent_var: e_ext})
         model_data = self.model.eval(params=params, **kwargs)
         # Multiply by the X-spacing to preserve normalization
-        de = (e[-1] - e[0])/(len(e) - 1)  # energy spacing
-        return de * convolve(model_data, res_data)
+        result = de * self.fft_convolve(model_data, res_data)
+        result.setflags(write=False)
+        if key is not None:
+            self._last_eval = (e_ext, key, result)
+        return result
@@ -4,9 +4,105 @@ import lmfit
 import traitlets
 import ipywidgets as ipyw
 import weakref
+import threading
+from contextlib import contextmanager
+from functools import wraps
 from qef.io import log_qef
 
 
+def call_later(wait, func, *args, **kwargs):
+    r"""Schedule a call to a function after :code:`wait` seconds.
+
+    The call is scheduled in the running :mod:`asyncio` event loop, such
+    as the loop of the Jupyter kernel, thus the function runs in the same
+    thread as the widget callbacks. Without a running loop, the call is
+    carried out by a daemon timer thread, which does not block the exit
+    of the interpreter.
+
+    Parameters
+    ----------
+    wait : float
+        waiting time, in seconds
+    func : callable
+        function to call
+    args : list
+        positional arguments of the function
+    kwargs : dict
+        keyword arguments of the function
+
+    Returns
+    -------
+    object
+        handle of the scheduled call, with a :code:`cancel` method
+    """
+    try:
+        import asyncio
+        loop = asyncio.get_running_loop()
+    except (ImportError, AttributeError, RuntimeError):  # no running loop
+        timer = threading.Timer(wait, func, args=args, kwargs=kwargs)
+        timer.daemon = True
+        timer.start()
+        return timer
+    return loop.call_later(wait, lambda: func(*args, **kwargs))
+
+
+def debounce(wait, scheduler=call_later):
+    r"""Decorator postponing the call to a function until :code:`wait`
+    seconds have elapsed since the last call. Only the last call of a
+    burst of calls is carried out.
+
+    Parameters
+    ----------
+    wait : float
+        waiting time, in seconds
+    scheduler : callable
+        schedules the call with signature :code:`scheduler(wait, func,
+        *args, **kwargs)` and returns a handle with a :code:`cancel` method.
+        Default is :func:`~qef.widgets.parameter.call_later`
+    """
+    def decorator(func):
+        pending = [None]  # handle of the pending call
+
+        @wraps(func)
+        def debounced(*args, **kwargs):
+            if pending[0] is not None:
+                pending[0].cancel()
+            pending[0] = scheduler(wait, func, *args, **kwargs)
+        return debounced
+    return decorator
+
+
+#: Layouts shared among widgets, keyed by their attributes
+_shared_layouts = dict()
+
+
+def shared_layout(**kwargs):
+    r"""Layout shared by all the widgets created with the same layout
+    attributes, instead of one layout for each widget.
+
+    Modifying the attributes of the returned layout affects all the widgets
+    sharing it.
+
+    Parameters
+    ----------
+    kwargs : dict
+        attributes of the layout
+
+    Returns
+    -------
+    :class:`~ipywidgets:ipywidgets.widgets.widget_layout.Layout`
+    """
+    key = tuple(sorted(kwargs.items()))
+    if key not in _shared_layouts:
+        _shared_layouts[key] = ipyw.Layout(**kwargs)
+    return _shared_layouts[key]
+
+
+def _element_layout(width):
+    r"""Shared layout of a component of a parameter widget"""
+    return shared_layout(width='{}px'.format(width), margin='0px')
+
+
 class ParameterWidget(ipyw.Box):
     r"""One possible representation of a fitting parameter.
     Inherits from `ipywidgets.widgets.widget_box.Box <https://github.com/jupyter-widgets/ipywidgets/blob/v7.0.0a1/ipywidgets/widgets/widget_box.py#L18>`_
@@ -15,25 +111,85 @@ class ParameterWidget(ipyw.Box):
     ----------
     show_header : Bool
         Hide or show names of the widget components `min`, `value`,...
+    continuous_update : Bool
+        If :code:`False`, components `min`, `value`, and `max` update their
+        values when the user presses Enter or leaves the field, instead of
+        at every keystroke
     """  # noqa: E501
 
-    def __init__(self, show_header=True):
-        def el_ly(w):
-            return dict(width='{}px'.format(w), margin='0px')
+    #: Header labels and their widths, in pixels
+    header_labels = (('-inf', 125), ('min', 165), ('value', 170),
+                     ('inf', 125), ('max', 165), ('vary', 125),
+                     ('expression', 275))
+    _header = None  # header shared by all instances
+
+    @classmethod
+    def shared_header(cls):
+        r"""Header with the names of the widget components, created once
+        and shared by all instances
+
+        Returns
+        -------
+        :class:`~ipywidgets:ipywidgets.widgets.widget_box.HBox`
+        """
+        if cls._header is None:
+            l_lbs = [ipyw.Label(k, layout=_element_layout(v))
+                     for (k, v) in cls.header_labels]
+            box_ly = shared_layout(display='flex', margin='0px',
+                                   border='solid')
+            cls._header = ipyw.HBox(l_lbs, layout=box_ly)
+        return cls._header
+
+    @classmethod
+    def make_panel(cls, params):
+        r"""Panel of parameter widgets below a single header
+
+        Parameters
+        ----------
+        params : sequence
+            :class:`~qef.widgets.parameter.ParameterWithTraits` instances,
+            each linked to one widget of the panel
+
+        Returns
+        -------
+        :class:`~ipywidgets:ipywidgets.widgets.widget_box.VBox`
+            header followed by one widget per parameter, without headers
+
+        Notes
+        -----
+        Component :code:`expr` is not linked, since a
+        :class:`~ipywidgets:ipywidgets.widgets.widget_string.Text` widget
+        cannot hold the :code:`None` expression of a parameter.
+        """
+        mapping = {name: name for name in
+                   ParameterCallbacksMixin.widget_names if name != 'expr'}
+        widgets = list()
+        for param in params:
+            widget = cls(show_header=False)
+            param.link_widget(widget, mapping=mapping)
+            widgets.append(widget)
+        return ipyw.VBox([cls.shared_header()] + widgets)
+
+    def __init__(self, show_header=True, continuous_update=False):
+        el_ly = _element_layout
+        cu = continuous_update
 
         # minimum block
         self.nomin = ipyw.Checkbox(value=True, layout=el_ly(125))
-        self.min = ipyw.FloatText(value=-float('inf'), layout=el_ly(165))
-        box_ly = dict(border='1px solid black', display='flex', margin='0px',
-                      flex_flow='row', width='290px')
+        self.min = ipyw.FloatText(value=-float('inf'), continuous_update=cu,
+                                  layout=el_ly(165))
+        box_ly = shared_layout(border='1px solid black', display='flex',
+                               margin='0px', flex_flow='row', width='290px')
         self.minbox = ipyw.Box([self.nomin, self.min], layout=box_ly)
 
         # value element
-        self.value = ipyw.FloatText(value=0, layout=el_ly(170))
+        self.value = ipyw.FloatText(value=0, continuous_update=cu,
+                                    layout=el_ly(170))
 
         # maximum block
         self.nomax = ipyw.Checkbox(value=True, layout=el_ly(125))
-        self.max = ipyw.FloatText(value=float('inf'), layout=el_ly(165))
+        self.max = ipyw.FloatText(value=float('inf'), continuous_update=cu,
+                                  layout=el_ly(165))
         self.maxbox = ipyw.Box([self.nomax, self.max], layout=box_ly)
 
         # constraints block
@@ -48,26 +204,39 @@ class ParameterWidget(ipyw.Box):
         # Header labels
         self.header = None
         if show_header is True:
-            d_lbs = (('-inf', 125), ('min', 165), ('value', 170),
-                     ('inf', 125), ('max', 165), ('vary', 125),
-                     ('expression', 275))
-            l_lbs = [ipyw.Label(k, layout=el_ly(v)) for (k, v) in d_lbs]
-            box_ly = dict(display='flex', margin='0px', border='solid')
-            self.header = ipyw.HBox(l_lbs, layout=box_ly)
+            self.header = self.shared_header()
 
         # Layout
         if self.header is None:
-            box_ly = dict(display='flex', margin='0px', border='solid',
-                          flex_flow='row')
+            box_ly = shared_layout(display='flex', margin='0px',
+                                   border='solid', flex_flow='row')
             super(ParameterWidget, self).__init__(self.elements, layout=box_ly)
         else:
-            box_ly = dict(display='flex', margin='0px', border='solid')
+            box_ly = shared_layout(display='flex', margin='0px',
+                                   border='solid')
             b_els = ipyw.HBox(self.elements, layout=box_ly)
-            box_ly.update({'flex_flow': 'column'})
+            box_ly = shared_layout(display='flex', margin='0px',
+                                   border='solid', flex_flow='column')
             super(ParameterWidget, self).__init__([self.header, b_els],
                                                   layout=box_ly)
 
 
+def _weak_callback(instance, name):
+    r"""Callback invoking method `name` of `instance` without holding a
+    reference to `instance`
+
+    Observers registered in the components of a widget would otherwise
+    reference the widget, creating reference cycles.
+    """
+    ref = weakref.ref(instance)
+
+    def callback(change):
+        obj = ref()
+        if obj is not None:
+            getattr(obj, name)(change)
+    return callback
+
+
 class ParameterCallbacksMixin(object):
     r"""Implement relationships between the different components of an
     ipywidget exposing all or some of the parameter attributes
@@ -82,27 +251,82 @@ class ParameterCallbacksMixin(object):
     #: Representation of infinity value
     inf = float('inf')
     widget_names = ('nomin', 'min', 'value', 'nomax', 'max', 'vary', 'expr')
+    _widget_names_set = frozenset(widget_names)
+    #: Names of the callback and component attributes for each widget name
+    _callback_names = {n: n + '_value_change' for n in widget_names}
+    _component_names = {n: '_w_' + n for n in widget_names}
+    #: Callbacks return early while :code:`True`
+    _suspend = False
+    #: Seconds of inactivity before processing changes of :code:`min`,
+    #: :code:`value`, :code:`max`, and :code:`expr`. No delay if zero
+    debounce_wait = 0.0
+    #: Widget names whose callbacks are debounced
+    debounced_names = ('min', 'value', 'max', 'expr')
+    #: Components and the callbacks registered in them
+    _registered_callbacks = ()
+
+    @contextmanager
+    def _batch(self):
+        r"""Suspend the callbacks while changing several widget components,
+        preventing a cascade of notifications among the components"""
+        suspend = self._suspend
+        self._suspend = True
+        try:
+            yield
+        finally:
+            self._suspend = suspend
 
     def validate_facade(self):
         r"""Ascertain that keys of :code:`facade` attribute are contained in
         :const:`~qef.widgets.parameter.ParameterCallbacksMixin.widget_names`"""
-        fs = set(self.facade.keys())
-        assert set(ParameterCallbacksMixin.widget_names).issuperset(fs)
+        assert self._widget_names_set.issuperset(self.facade)
 
     def initialize_callbacks(self):
-        r"""Register callbacks to sync widget components"""
+        r"""Register callbacks to sync widget components
+
+        Components in :code:`facade` are also bound to attributes
+        :code:`_w_nomin`, :code:`_w_min`,... which are :code:`None` for
+        missing components. Callbacks registered by previous calls are
+        removed, thus callbacks are never registered twice."""
         self.validate_facade()
-        for widget_name in self.facade:
-            widget = self.facade[widget_name]
+        self.remove_callbacks()
+        registered = list()
+        for widget_name in self.widget_names:
+            widget = self.facade.get(widget_name)
+            setattr(self, self._component_names[widget_name], widget)
             if widget is not None:
-                callback = getattr(self, widget_name + '_value_change')
+                callback = _weak_callback(self,
+                                          self._callback_names[widget_name])
+                if self.debounce_wait > 0 and\
+                        widget_name in self.debounced_names:
+                    callback = debounce(self.debounce_wait)(callback)
                 widget.observe(callback, 'value', 'change')
+                registered.append((widget, callback))
+        self._registered_callbacks = registered
+
+    def remove_callbacks(self):
+        r"""Unregister the callbacks syncing the widget components"""
+        for widget, callback in self._registered_callbacks:
+            widget.unobserve(callback, 'value', 'change')
+        self._registered_callbacks = ()
+
+    def close(self):
+        r"""Remove all observers of the widget components, then close the
+        widget"""
+        self.remove_callbacks()
+        for widget in getattr(self, 'facade', dict()).values():
+            widget.unobserve_all()
+        super(ParameterCallbacksMixin, self).close()
 
     def nomin_value_change(self, change):
         r"""Set :code:`min` to :math:`-\infty` if :code:`nomin` is checked"""
-        if 'min' in self.facade and change.new is True:
-            if self.facade['min'].value > -self.inf:  # prevent cycles
-                self.facade['min'].value = -self.inf
+        if self._suspend:
+            return
+        w_min = self._w_min
+        if change.new is True and w_min is not None:
+            ninf = -self.inf
+            if w_min.value > ninf:  # prevent cycles
+                w_min.value = ninf
 
     def min_value_change(self, change):
         r"""Notify other widgets if :code:`min` changes.
@@ -111,20 +335,31 @@ class ParameterCallbacksMixin(object):
         1. Uncheck :code:`nomin` if new value is entered in :code:`min`
         2. Update :code:`value.value` if it becomes smaller than
            :code:`min.value`"""
-        f = self.facade
-        if 'max' in f and change.new > f['max'].value:
-            f['min'].value = change.old  # reject change
-        else:  # Notify other widgets
-            if 'nomin' in f and change.new > -self.inf:
-                f['nomin'].value = False
-            if 'value' in f and change.new > f['value'].value:
-                    f['value'].value = change.new
+        if self._suspend:
+            return
+        new = change.new
+        w_max = self._w_max
+        with self._batch():
+            if w_max is not None and new > w_max.value:
+                self._w_min.value = change.old  # reject change
+            else:  # Notify other widgets
+                w_nomin = self._w_nomin
+                if w_nomin is not None and new > -self.inf:
+                    if w_nomin.value:  # write only if changed
+                        w_nomin.value = False
+                w_value = self._w_value
+                if w_value is not None and new > w_value.value:
+                    w_value.value = new
 
     def nomax_value_change(self, change):
         r"""Set :code:`max` to :math:`\infty` if :code:`nomax` is checked"""
-        if 'max' in self.facade and change.new is True:
-            if self.facade['max'].value < self.inf:  # prevent cycles
-                self.facade['max'].value = self.inf
+        if self._suspend:
+            return
+        w_max = self._w_max
+        if change.new is True and w_max is not None:
+            inf = self.inf
+            if w_max.value < inf:  # prevent cycles
+                w_max.value = inf
 
     def max_value_change(self, change):
         r"""Notify other widgets if :code:`min` changes.
@@ -133,34 +368,57 @@ class ParameterCallbacksMixin(object):
         1. Uncheck :code:`nomax` if new value is entered in :code:`max`
         2. Update :code:`value.value` if it becomes bigger than
         :code:`max.value`"""
-        f = self.facade
-        if 'min' in f and change.new < f['min'].value:
-            f['max'].value = change.old  # reject change
-        else:  # Notify other widgets
-            if 'nomax' in f and change.new < self.inf:
-                f['nomax'].value = False
-            if 'value' in f and change.new < f['value'].value:
-                    f['value'].value = change.new
+        if self._suspend:
+            return
+        new = change.new
+        w_min = self._w_min
+        with self._batch():
+            if w_min is not None and new < w_min.value:
+                self._w_max.value = change.old  # reject change
+            else:  # Notify other widgets
+                w_nomax = self._w_nomax
+                if w_nomax is not None and new < self.inf:
+                    if w_nomax.value:  # write only if changed
+                        w_nomax.value = False
+                w_value = self._w_value
+                if w_value is not None and new < w_value.value:
+                    w_value.value = new
 
     def value_value_change(self, change):
         r"""Validate :code:`value` is within bounds. Otherwise set
         :code:`value` as the closest bound value"""
-        if 'min' in self.facade and change.new < self.facade['min'].value:
-            self.facade['value'].value = self.facade['min'].value
-        elif 'max' in self.facade and change.new > self.facade['max'].value:
-            self.facade['value'].value = self.facade['max'].value
+        if self._suspend:
+            return
+        new = change.new
+        w_min, w_max = self._w_min, self._w_max
+        lower = -self.inf if w_min is None else w_min.value
+        upper = self.inf if w_max is None else w_max.value
+        # max and min return their first argument unless the bound is
+        # exceeded, thus `new` is returned unchanged if within bounds or NaN
+        clamped = min(max(new, lower), upper)
+        if clamped is not new:
+            self._w_value.value = clamped
 
     def vary_value_change(self, change):
         r"""enable/disable editing of :code:`min`, :code:`max`, :code:`value`,
         and :code:`expr`"""
-        for name in ('nomin', 'min', 'value', 'nomax', 'max', 'expr'):
-            if name in self.facade:
-                self.facade['name'].disabled = not change.new
+        if self._suspend:
+            return
+        disabled = not change.new
+        for widget in (self._w_nomin, self._w_min, self._w_value,
+                       self._w_nomax, self._w_max, self._w_expr):
+            if widget is not None and widget.disabled != disabled:
+                widget.disabled = disabled  # write only if changed
 
     def expr_value_change(self, change):
         r"""enable/disable :code:`min`, :code:`max`, and :code:`value`"""
-        if 'vary' in self.facade:
-            self.facade['vary'].value = True if change.new == '' else False
+        if self._suspend:
+            return
+        w_vary = self._w_vary
+        if w_vary is not None:
+            vary = change.new == ''
+            if w_vary.value != vary:  # write only if changed
+                w_vary.value = vary
 
 
 def create_facade(widget, mapping=None):
@@ -190,21 +448,21 @@ def create_facade(widget, mapping=None):
     facade : dict
     """  # noqa: E501
     names = ParameterCallbacksMixin.widget_names  # expected widget names
+    names_set = ParameterCallbacksMixin._widget_names_set
     if mapping is not None:
         if isinstance(mapping, str) and mapping in names:
             # subscribing a non-composite widget
             facade = {mapping: widget}
         elif isinstance(mapping, dict):
-            k = set(mapping.keys())
-            if k & set(names) != k:
+            if not names_set.issuperset(mapping):
                 msg = 'mapping contains invalid widget names'
                 log_qef.error(msg)
                 raise KeyError(msg)
-            facade = {name: widget.__dict__[wn]
+            facade = {name: getattr(widget, wn)
                       for name, wn in mapping.items()}
     else:  # inspection
-        facade = {name: widget.__dict__[name] for name in names
-                  if name in widget.__dict__}
+        present = names_set.intersection(vars(widget))
+        facade = {name: getattr(widget, name) for name in present}
         if bool(facade) is False:
             facade = {'value': widget}
     return facade
@@ -241,6 +499,10 @@ def add_widget_facade(widget, mapping=None):
     return widget
 
 
+#: Widget types extended with ParameterCallbacksMixin, keyed by widget type
+_callbacks_classes = dict()
+
+
 def add_widget_callbacks(widget, mapping=None):
     r"""Extend the widget's type with
     :class:`~qef.widgets.parameter.ParameterCallbacksMixin`
@@ -263,11 +525,58 @@ def add_widget_callbacks(widget, mapping=None):
         by the fitting parameter.
     """  # noqa: E501
     base_class = widget.__class__
-    widget.__class__ = type(base_class.__name__,
-                            (base_class, ParameterCallbacksMixin), {})
+    if not issubclass(base_class, ParameterCallbacksMixin):
+        # one extended type per widget type, shared by all its instances
+        if base_class not in _callbacks_classes:
+            # the mixin comes first, so that its close() is called
+            _callbacks_classes[base_class] = type(
+                base_class.__name__, (ParameterCallbacksMixin, base_class), {})
+        widget.__class__ = _callbacks_classes[base_class]
     widget.initialize_callbacks()
 
 
+_missing = object()  # marks attributes not set yet
+
+
+class _TraitMirror(object):
+    r"""Data descriptor storing a :class:`~lmfit.parameter.Parameter`
+    attribute in the instance dictionary and mirroring its changes onto
+    a trait
+
+    Only assignments to the wrapped attribute run Python code, instead of
+    every attribute assignment of the parameter.
+    """
+
+    def __init__(self, attr, trait):
+        self.attr = attr
+        self.trait = trait
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.attr]
+        except KeyError:
+            raise AttributeError(self.attr)
+
+    def __set__(self, instance, value):
+        # no-op writes neither set nor mirror. NaN never equals itself
+        current = instance.__dict__.get(self.attr, _missing)
+        if current is value or (current == value and value == value):
+            return
+        instance.__dict__[self.attr] = value
+        # traits notify their observers only if the value changes, thus
+        # the observer writing back to this attribute ends the cycle
+        setattr(instance, self.trait, value)
+
+
+def _set_expression(param, expr):
+    r"""Set the expression of `param` through property :code:`expr`, which
+    also parses the expression. Skipped if the expression is unchanged"""
+    if expr != param._expr:
+        lmfit.Parameter.expr.fset(param, expr)
+
+
 class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
     r"""Wrapper of :class:`~lmfit.parameter.Parameter` with
     :class:`~traitlets.TraitType` allows synchronization with ipywidgets
@@ -317,12 +626,23 @@ class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
     #: :class:`~lmfit.parameter.Parameter` attribute :code:`_expr`
     texpr = traitlets.Unicode(allow_none=True)
 
+    # Name translations, for hashed lookups when setting attributes
+    _feature_trait = dict(zip(param_features, trait_names))
+    _attr_trait = dict(zip(param_attrs, trait_names))
+    _trait_attr = dict(zip(trait_names, param_attrs))
+    # Parameter attributes stored through descriptors mirroring the traits
+    _val = _TraitMirror('_val', 'tvalue')
+    min = _TraitMirror('min', 'tmin')
+    max = _TraitMirror('max', 'tmax')
+    vary = _TraitMirror('vary', 'tvary')
+    _expr = _TraitMirror('_expr', 'texpr')
+
     @classmethod
     def feature_to_trait(cls, feature):
         r"""From :class:`~lmfit.parameter.Parameter` feature name to
         :class:`~traitlets.TraitType` name"""
         try:
-            return cls.trait_names[cls.param_features.index(feature)]
+            return cls._feature_trait[feature]
         except KeyError:
             msg = '{} is not a parameter feature'.format(feature)
             log_qef.error(msg)
@@ -333,7 +653,7 @@ class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
         r"""From :class:`~lmfit.parameter.Parameter` attribute name to
         :class:`~traitlets.TraitType` name"""
         try:
-            return cls.trait_names[cls.param_attrs.index(attr)]
+            return cls._attr_trait[attr]
         except KeyError:
             msg = '{} is not a parameter feature'.format(attr)
             log_qef.error(msg)
@@ -344,7 +664,7 @@ class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
         r"""From :class:`~traitlets.TraitType` name to
         :class:`~lmfit.parameter.Parameter` attribute name"""
         try:
-            return cls.param_attrs[cls.trait_names.index(name)]
+            return cls._trait_attr[name]
         except KeyError:
             msg = '{} is not a valid trait'.format(name)
             log_qef.error(msg)
@@ -355,33 +675,35 @@ class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
         kwargs = dict(name=name, value=value, vary=vary, min=min, max=max,
                       expr=expr, brute_step=brute_step, user_data=user_data)
         lmfit.Parameter.__init__(self, **kwargs)
-        self._widget_links = weakref.WeakSet()
+        # links to widgets, keyed by widget id
+        self._widget_links = weakref.WeakValueDictionary()
 
     def __repr__(self):
         r"""String representation at debug level"""
         p_repr = super(ParameterWithTraits, self).__repr__()
         return '<ParameterWithTraits {}>'.format(p_repr)
 
-    def __setattr__(self, key, value):
-        r"""Setting attributes making sure :class:`~lmfit.parameter.Parameter`
-        attributes and :class:`~traitlets.TraitType` stay in sync"""
-        if key in ParameterWithTraits.param_attrs:
-            # attribute of Parameter
-            lmfit.Parameter.__setattr__(self, key, value)
-            other_key = ParameterWithTraits.attr_to_trait(key)
-            other_value = getattr(self, other_key)
-            if value != other_value:  # prevent cycling
-                traitlets.HasTraits.__setattr__(self, other_key, value)
+    @traitlets.observe(*trait_names)
+    def _trait_change(self, change):
+        r"""Mirror trait changes onto :class:`~lmfit.parameter.Parameter`
+        attributes"""
+        attr = self._trait_attr[change['name']]
+        if attr == '_expr':
+            # expressions are parsed, but only if they change
+            _set_expression(self, change['new'])
         else:
-            # attribute of HasTraits
-            traitlets.HasTraits.__setattr__(self, key, value)
-            if key in ParameterWithTraits.trait_names:
-                other_key = ParameterWithTraits.trait_to_attr(key)
-                other_value = getattr(self, other_key)
-                if value != other_value:  # prevent cycling
-                    lmfit.Parameter.__setattr__(self, other_key, value)
-
-    def link_widget(self, widget, mapping=None):
+            setattr(self, attr, change['new'])
+
+    def set(self, *args, **kwargs):
+        r"""Same signature as :meth:`~lmfit.parameter.Parameter.set`.
+
+        Notifications of trait changes are held until all attributes are
+        set, thus observers of the traits are called once per trait and
+        never see a partially updated parameter."""
+        with self.hold_trait_notifications():
+            lmfit.Parameter.set(self, *args, **kwargs)
+
+    def link_widget(self, widget, mapping=None, read_only=False):
         r"""Link the value of a single ipywidget to one trait, or the values
         of the element widgets of a composite ipywidget to different traits.
         The specific traits can be specified with the :code:`mapping` argument.
@@ -402,11 +724,20 @@ class ParameterWithTraits(lmfit.Parameter, traitlets.HasTraits):
             If the inspection is unsuccessful, the widget will be associated
             with the standard widget name 'value' to represent the values
             taken by the fitting parameter.
+        read_only : Bool
+            If :code:`True`, changes propagate only from the parameter to the
+            widget, for widgets displaying the parameter without editing it.
+            Only the parameter traits are observed.
         """  # noqa: E501
+        link = traitlets.dlink if read_only is True else traitlets.link
         add_widget_facade(widget, mapping=mapping)
         add_widget_callbacks(widget, mapping=mapping)
         for pn, w in widget.facade.items():
-            tname = self.feature_to_trait(pn)
-            if w not in [l.target[0] for l in self._widget_links]:
-                lnk = traitlets.link((self, tname), (w, 'value'))
-                self._widget_links.add(lnk)
+            tname = self._feature_trait.get(pn)
+            if tname is None:
+                continue  # e.g. 'nomin', not a parameter feature
+            lnk = self._widget_links.get(id(w))
+            # the id of a deleted widget may be reused by a new widget
+            if lnk is None or lnk.target[0] is not w:
+                lnk = link((self, tname), (w, 'value'))
+                self._widget_links[id(w)] = lnk
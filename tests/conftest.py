@@ -8,6 +8,8 @@ import numpy as np
 import ipywidgets as ipyw
 from lmfit.lineshapes import lorentzian
 
+from qef.io.loaders import load_nexus
+
 # Resolve the path to the "external data"
 this_module_path = sys.modules[__name__].__file__
 data_dir = pjn(os.path.dirname(this_module_path), 'data')
@@ -19,6 +21,9 @@ def ltz():
     x = np.arange(-0.1, 0.5, 0.0004)  # energy domain, in meV
     params = dict(amplitude=1.0, center=0.0, sigma=0.025)
     y = lorentzian(x, **params)
+    # session-wide arrays, shared by all tests
+    x.setflags(write=False)
+    y.setflags(write=False)
     return dict(x=x, y=y, p=params)
 
 
@@ -33,6 +38,19 @@ def io_fix():
                 dave=pjn(data_dir, 'io', 'dave_file.grp'))
 
 
+@pytest.fixture(scope='session')
+def irs_fix(io_fix):
+    r"""IRIS resolution and reduced data, loaded once per session"""
+    def load(file_name):
+        data = load_nexus(file_name)
+        for key in ('x', 'y', 'e'):
+            data[key] = np.ascontiguousarray(data[key], dtype=np.float64)
+            data[key].setflags(write=False)
+        return data
+    return dict(res=load(io_fix['irs_res_f']), dat=load(io_fix['irs_red_f']),
+                q_values=io_fix['q_values'])
+
+
 @pytest.fixture(scope='session')
 def widgets_fix():
     class CustomParm(ipyw.HBox):
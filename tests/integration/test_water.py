@@ -6,35 +6,39 @@ import pytest
 import os
 import numpy as np
 from numpy.testing import assert_almost_equal
+from scipy.sparse import lil_matrix
 
 from lmfit.models import LinearModel, LorentzianModel, ConstantModel
 import lmfit
 from lmfit.model import Model
 
 from qef.constants import hbar  # units of meV x ps  or ueV x ns
-from qef.io.loaders import load_nexus
 from qef.models.deltadirac import DeltaDiracModel
 from qef.models.resolution import TabulatedResolutionModel
 from qef.operators.convolve import Convolve
 
 
-def test_water(io_fix):
-    # Load data
-    res = load_nexus(io_fix['irs_res_f'])
-    dat = load_nexus(io_fix['irs_red_f'])
-    q_vals = io_fix['q_values']
+def test_water(irs_fix):
+    # Loaded data
+    res = irs_fix['res']
+    dat = irs_fix['dat']
+    q_vals = irs_fix['q_values']
 
     # Define the fitting range
     e_min = -0.4
     e_max = 0.4
-    # Find indexes of dat['x'] with values in (e_min, e_max)
-    mask = np.intersect1d(np.where(dat['x'] > e_min),
-                          np.where(dat['x'] < e_max))
+    # Select dat['x'] with values in (e_min, e_max)
+    mask = (dat['x'] > e_min) & (dat['x'] < e_max)
     # Drop data outside the fitting range
     fr = dict()  # fitting range. Use in place of 'dat'
     fr['x'] = dat['x'][mask]
-    fr['y'] = np.asarray([y[mask] for y in dat['y']])
-    fr['e'] = np.asarray([e[mask] for e in dat['e']])
+    fr['y'] = dat['y'][:, mask]
+    fr['e'] = dat['e'][:, mask]
+    fr['w'] = 1.0 / fr['e']  # weights of the residuals, computed once
+
+    # Resolution table shared by all models, converted once
+    res_x = np.ascontiguousarray(res['x'], dtype=np.float64)
+    res_y = np.ascontiguousarray(res['y'], dtype=np.float64)
 
     # Create the model
     def generate_model_and_params(spectrum_index=None):
@@ -49,7 +53,7 @@ def test_water(io_fix):
         # l_amplitude, l_center, l_sigma (also l_fwhm, l_height)
         inelastic = LorentzianModel(prefix='l_' + sp)
         # r_amplitude, r_center (both fixed)
-        resolution = TabulatedResolutionModel(res['x'], res['y'],
+        resolution = TabulatedResolutionModel(res_x, res_y, copy=False,
                                               prefix='r_' + sp)
         background = LinearModel(prefix='b_' + sp)  # b_slope, b_intercept
 
@@ -82,17 +86,24 @@ def test_water(io_fix):
         params[name].set(value=value)
     # Carry out the fit
     fit = model.fit(fr['y'][0], x=fr['x'], params=params,
-                    weights=1.0 / fr['e'][0])
+                    weights=fr['w'][0])
     assert_almost_equal(fit.redchi, 1.72, decimal=2)
 
     # Carry out sequential fit
     n_spectra = len(fr['y'])
     fits = [None, ] * n_spectra  # store fits for all the tried spectra
     fits[0] = fit  # store previous fit
+    # Spectra are sorted by increasing q. Each fit starts from the initial
+    # guess, except for the parameters not depending on q (elastic line
+    # center and intensity scale), taken from the previous optimum.
+    # Q-dependent parameters are not carried over, since they may lead the
+    # fit to a different local minimum
     for i in range(1, n_spectra):
         y_exp = fr['y'][i]
-        e_exp = fr['e'][i]
-        fit = model.fit(y_exp, x=fr['x'], params=params, weights=1.0 / e_exp)
+        p = params.copy()
+        for name in ('e_center', 'I_c'):
+            p[name].set(value=fit.params[name].value)
+        fit = model.fit(y_exp, x=fr['x'], params=p, weights=fr['w'][i])
         fits[i] = fit  # store fit results
     assert_almost_equal([f.redchi for f in fits],
                         [1.72, 1.15, 0.81, 0.73, 0.73, 0.75, 0.81, 0.86, 0.75,
@@ -121,12 +132,15 @@ def test_water(io_fix):
     # create one model for each spectrum, but collect all parameters under
     # a single instance of the Parameters class.
     l_model = list()
-    g_params = lmfit.Parameters()
+    # constants of the Teixeira expressions, as symbols rather than literals
+    usersyms = {'q2_{}'.format(i): q * q for i, q in enumerate(q_vals)}
+    usersyms['hbar'] = hbar
+    g_params = lmfit.Parameters(usersyms=usersyms)
     for i in range(n_spectra):
         # model and parameters for one of the spectra
         m, ps = generate_model_and_params(spectrum_index=i)
         l_model.append(m)
-        [g_params.add(p) for p in ps.values()]
+        g_params.add_many(*ps.values())
 
     # Initialize parameter set with optimized parameters from sequential fit
     for i in range(n_spectra):
@@ -146,25 +160,40 @@ def test_water(io_fix):
 
     # Tie each lorentzian l_i_sigma to the teixeira expression
     for i in range(n_spectra):
-        q2 = q_vals[i] * q_vals[i]
-        fmt = '{hbar}*difcoef*{q2}/(1+difcoef*{q2}*tau)'
-        teixeira_expression = fmt.format(hbar=hbar, q2=q2)
-        g_params['l_{}_sigma'.format(i)].set(expr=teixeira_expression)
+        fmt = 'hbar*difcoef*q2_{i}/(1+difcoef*q2_{i}*tau)'
+        g_params['l_{}_sigma'.format(i)].set(expr=fmt.format(i=i))
 
     # Carry out the Simultaneous Fit
+    fr_x = fr['x']  # fitting range of energies
+    fr_y = fr['y']  # experimental intensities
+    fr_w = fr['w']  # inverse of the experimental errors
+
     def residuals(params):
-        l_residuals = list()
-        for i in range(n_spectra):
-            x = fr['x']  # fitting range of energies
-            y = fr['y'][i]  # associated experimental intensities
-            e = fr['e'][i]  # associated experimental errors
-            model_evaluation = l_model[i].eval(x=x, params=params)
-            l_residuals.append((model_evaluation - y) / e)
-        return np.concatenate(l_residuals)
+        # rows of a single array in place of a list of arrays to concatenate
+        out = np.empty(fr_y.shape)
+        for i, m in enumerate(l_model):
+            np.subtract(m.eval(x=fr_x, params=params), fr_y[i], out=out[i])
+            out[i] *= fr_w[i]
+        return out.ravel()
     # Minimizer object using the parameter set for all models and the
     # function to calculate all the residuals.
+    #
+    # The residuals of one spectrum depend only on the parameters of that
+    # spectrum and on the global parameters. Finite differences perturb
+    # sets of parameters not sharing spectra together, thus requiring
+    # fewer evaluations of the residuals for the Jacobian
+    var_names = [name for name, p in g_params.items()
+                 if p.vary and p.expr is None]
+    n_e = len(fr_x)
+    sparsity = lil_matrix((n_spectra * n_e, len(var_names)), dtype=int)
+    for j, name in enumerate(var_names):
+        if name in ('difcoef', 'tau'):
+            sparsity[:, j] = 1
+        else:
+            i = int(name.split('_')[1])  # e.g. 'e_3_amplitude' for i=3
+            sparsity[i * n_e: (i + 1) * n_e, j] = 1
     minimizer = lmfit.Minimizer(residuals, g_params)
-    g_fit = minimizer.minimize()
+    g_fit = minimizer.minimize(method='least_squares', jac_sparsity=sparsity)
     assert_almost_equal(g_fit.redchi, 0.93, decimal=2)
 
 
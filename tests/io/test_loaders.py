@@ -4,10 +4,21 @@ from __future__ import (absolute_import, division, print_function)
 
 import pytest
 import os
+import h5py
 from numpy.testing import assert_almost_equal
 from qef.io import loaders
 
 
+def test_search_attribute(io_fix):
+    with h5py.File(io_fix['irs_red_f'], 'r') as f:
+        matches = loaders.search_attribute(f, 'units')
+        assert len(matches) > 0
+        assert all(k == 'units' for _, (k, _) in matches)
+        assert len(loaders.search_attribute(f, 'UNITS')) == 0
+        assert len(loaders.search_attribute(f, 'UNITS', ignore_case=True)) ==\
+            len(matches)
+
+
 def test_load_nexus(io_fix):
     data = loaders.load_nexus(io_fix['irs_red_f'])
     assert_almost_equal(data['q'][5], 6.0000, decimal=4)
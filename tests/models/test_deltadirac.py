@@ -8,10 +8,32 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from lmfit.models import LorentzianModel
-from qef.models.deltadirac import DeltaDiracModel
+from qef.models.deltadirac import DeltaDiracModel, delta_dirac
 from qef.operators.convolve import Convolve
 
 
+def test_delta_dirac():
+    # Equispaced domain
+    x = np.linspace(-1.0, 1.0, 201)
+    dx = (x[-1] - x[0]) / (len(x) - 1)
+    y = delta_dirac(x, amplitude=42.0, center=0.1234)
+    assert np.count_nonzero(y) == 1
+    assert_allclose([x[np.argmax(y)], np.sum(y) * dx], [0.12, 42.0])
+    # Center outside the domain
+    assert np.argmax(delta_dirac(x, center=7.0)) == len(x) - 1
+    # Domain not exactly equispaced
+    x = np.sort(np.random.RandomState(42).uniform(-1.0, 1.0, 50))
+    for center in (-0.5, 0.0, 0.3, 0.9):
+        y = delta_dirac(x, center=center)
+        assert np.argmax(y) == np.argmin(np.abs(x - center))
+    # Non-finite center, e.g. a fit going astray
+    for center in (np.nan, np.inf, -np.inf):
+        assert np.argmax(delta_dirac(x, center=center)) == 0
+    # Very large finite centers select the nearest edge
+    assert np.argmax(delta_dirac(x, center=1e308)) == len(x) - 1
+    assert np.argmax(delta_dirac(x, center=-1e307)) == 0
+
+
 def test_guess():
     x = np.linspace(0, np.pi, 100)  # Energies in meV
     dx = (x[-1] - x[0]) / (len(x) - 1)  # x-spacing
@@ -24,5 +24,19 @@ def test_tabulatedmodel():
     assert abs(fit.best_values['center'] - peak_center) < 0.0001
 
 
+def test_tabulatedmodel_table():
+    x_sim = np.arange(-1.0, 1.0, 0.0003)
+    y_sim = lorentzian(x_sim, amplitude=1, center=0, sigma=0.042)
+    # tables are copied, unless sharing is requested
+    assert not np.shares_memory(TabulatedModel(x_sim, y_sim)._xs, x_sim)
+    assert np.shares_memory(TabulatedModel(x_sim, y_sim, copy=False)._xs,
+                            x_sim)
+    assert x_sim.flags.writeable  # the caller's table is left writable
+    # unsorted tables are sorted
+    model = TabulatedModel(x_sim[::-1], y_sim[::-1])
+    np.testing.assert_array_equal(model._xs, x_sim)
+    np.testing.assert_array_equal(model._ys, y_sim)
+
+
 if __name__ == '__main__':
     pytest.main([os.path.abspath(__file__)])
@@ -3,17 +3,53 @@
 from __future__ import (absolute_import, division, print_function)
 
 import os
-from numpy.testing import assert_almost_equal
+import numpy as np
+from numpy.testing import assert_almost_equal, assert_allclose
 import pytest
 
-from qef.models.teixeira import TeixeiraWaterModel
+from lmfit.models import GaussianModel
+
+from qef.models.teixeira import (TeixeiraWaterModel, teixeira_water,
+                                 teixeira_water_batch, teixeira_water_jacobian,
+                                 fit_teixeira_fast)
 from qef.constants import hbar
+from qef.operators.convolve import Convolve
 
 
 def test_init():
     tx = TeixeiraWaterModel(prefix='tx_', q=0.3)
     assert 'tx_dcf*0.09/(1+tx_tau*tx_dcf*0.09)'\
            in tx.param_hints['fwhm']['expr']
+    p = tx.make_params()
+    assert 'tx_fwhm' in p['tx_height'].expr
+    tx.q = 0.5  # expressions follow changes of q
+    assert 'tx_dcf*0.25/(1+tx_tau*tx_dcf*0.25)' in tx.fwhm_expr
+    assert tx.param_hints['fwhm']['expr'] == tx.fwhm_expr
+
+
+def test_teixeira_water_zero_q():
+    x = np.linspace(-1, 1, 11)
+    y = teixeira_water(x, q=0.0, center=0.0)  # vanishing width
+    assert np.all(np.isfinite(y))
+    assert np.argmax(y) == 5
+    assert np.all(np.isfinite(teixeira_water_batch(x, q=(0.0, 0.3))))
+    model = TeixeiraWaterModel()  # default q is zero
+    assert np.all(np.isfinite(model.eval(model.make_params(), x=x)))
+    # guessed parameters and fits starting from them stay finite
+    guess = model.guess(y, x=x)
+    assert all(np.isfinite(guess[name].value)
+               for name in ('amplitude', 'center', 'tau', 'dcf'))
+    fr = fit_teixeira_fast(x, y, 0.0)
+    assert np.all(np.isfinite(fr.x))
+
+
+def test_teixeira_water_batch(ltz):
+    qs = (0.3, 0.9, 1.5)
+    params = dict(amplitude=2.0, center=0.01, tau=1.2, dcf=0.16)
+    y = teixeira_water_batch(ltz['x'], q=qs, **params)
+    assert y.shape == (len(qs), len(ltz['x']))
+    for i, q in enumerate(qs):
+        assert_allclose(y[i], teixeira_water(ltz['x'], q=q, **params))
 
 
 def test_guess(ltz):
@@ -31,5 +67,69 @@ def test_fit(ltz):
     assert_almost_equal(fr.params['fwhm'], 2 * ltz['p']['sigma'], decimal=6)
 
 
+def test_teixeira_water_jacobian(ltz):
+    params = [2.0, 0.01, 1.2, 0.16]
+    jac = teixeira_water_jacobian(ltz['x'], *params, q=0.9)
+    for i in range(len(params)):
+        step = 1.e-6 * params[i]
+        up, down = list(params), list(params)
+        up[i] += step
+        down[i] -= step
+        diff = teixeira_water(ltz['x'], *up, q=0.9) -\
+            teixeira_water(ltz['x'], *down, q=0.9)
+        assert_allclose(jac[:, i], diff / (2 * step), rtol=1.e-4,
+                        atol=1.e-6 * np.abs(jac[:, i]).max())
+
+
+def test_fit_teixeira_fast(ltz):
+    fr = fit_teixeira_fast(ltz['x'], ltz['y'], 0.3)
+    amplitude, center, tau, dcf = fr.x
+    dq2 = dcf * 0.3 * 0.3
+    fwhm = 2 * hbar * dq2 / (1 + tau * dq2)
+    assert_almost_equal(fwhm, 2 * ltz['p']['sigma'], decimal=6)
+    assert_almost_equal(center, ltz['p']['center'], decimal=6)
+
+
+def test_fit_teixeira_fast_resolution():
+    x = 0.002 * np.arange(-250, 251)  # energies, in meV
+    q = 0.9
+    model = Convolve(GaussianModel(prefix='r_'),
+                     TeixeiraWaterModel(prefix='t_', q=q))
+    p = model.make_params(r_amplitude=1.0, r_center=0.0, r_sigma=0.01,
+                          t_amplitude=1.0, t_center=0.0, t_tau=1.2,
+                          t_dcf=0.16)
+    for name in ('r_amplitude', 'r_center', 'r_sigma'):
+        p[name].set(vary=False)
+    y = model.eval(params=p, x=x)
+    resolution = model.resolution.eval(params=p, x=x)
+    names = ('t_amplitude', 't_center', 't_tau', 't_dcf')
+    p0 = [0.5, 0.01, 2.0, 0.3]  # away from the optimal values
+    for name, value in zip(names, p0):
+        p[name].set(value=value)
+    ref = model.fit(y, params=p, x=x)
+    fr = fit_teixeira_fast(x, y, q, resolution=resolution, p0=p0)
+
+    def hwhm(tau, dcf):
+        return hbar * dcf * q * q / (1 + tau * dcf * q * q)
+    # tau and dcf are degenerate for a single q value, but not the HWHM
+    amplitude, center, tau, dcf = fr.x
+    r = [ref.params[name].value for name in names]
+    assert_allclose([amplitude, center, hwhm(tau, dcf)],
+                    [r[0], r[1], hwhm(r[2], r[3])], rtol=1e-4, atol=1e-7)
+    assert_allclose([amplitude, center, hwhm(tau, dcf)],
+                    [1.0, 0.0, hwhm(1.2, 0.16)], rtol=1e-4, atol=1e-7)
+    # Jacobian is the convolution of the Jacobian of the model
+    for name, value in zip(names, fr.x):
+        p[name].set(value=value)
+    for i, name in enumerate(names):
+        step = 1.e-6
+        up, down = p.copy(), p.copy()
+        up[name].value += step
+        down[name].value -= step
+        diff = model.eval(params=up, x=x) - model.eval(params=down, x=x)
+        assert_allclose(fr.jac[:, i], diff / (2 * step),
+                        rtol=1e-4, atol=1e-6 * np.abs(diff).max() / step)
+
+
 if __name__ == '__main__':
     pytest.main([os.path.abspath(__file__)])
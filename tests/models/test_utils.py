@@ -0,0 +1,67 @@
+from __future__ import (absolute_import, division, print_function)
+
+import os
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from lmfit.models import LorentzianModel, Model
+
+from qef.models.utils import fit_parallel, prefix_params, warm_start_guess
+
+
+def test_prefix_params():
+    class AModel(Model):
+        def __init__(self, **kwargs):
+            def f(x, a=1.0, amplitude=1.0):
+                return a * amplitude * x
+            super(AModel, self).__init__(f, **kwargs)
+
+        @property
+        @prefix_params
+        def expr(self):
+            return 'amplitude/a'
+
+    assert AModel(prefix='m_').expr == 'm_amplitude/m_a'
+    assert AModel().expr == 'amplitude/a'
+
+
+def lorentzian_factory(q):
+    r"""Lorentzian model with starting parameters away from optimal"""
+    model = LorentzianModel()
+    return model, model.make_params(amplitude=2.0, center=0.0, sigma=0.1)
+
+
+@pytest.mark.parametrize('n_workers', (1, 2))
+def test_fit_parallel(ltz, n_workers):
+    q_values = (0.3, 0.5, 0.7, 0.9, 1.1)
+    # one Lorentzian for each q-value, with increasing widths
+    sigmas = [ltz['p']['sigma'] * (1 + q) for q in q_values]
+    model = LorentzianModel()
+    ys = np.asarray([model.eval(x=ltz['x'], amplitude=1.0, center=0.0,
+                                sigma=s) for s in sigmas])
+    results = fit_parallel(lorentzian_factory, ltz['x'], ys, q_values,
+                           n_workers=n_workers)
+    assert len(results) == len(q_values)
+    assert_allclose([params['sigma'].value for params, _ in results],
+                    sigmas, rtol=1e-4)
+
+
+def test_warm_start_guess(ltz):
+    q_values = (0.3, 0.5, 0.7, 0.9, 1.1)
+    model = LorentzianModel()
+    # two groups of Lorentzians of different widths
+    sigmas = [ltz['p']['sigma'] * (1 if q < 0.6 else 3) for q in q_values]
+    ys = np.asarray([model.eval(x=ltz['x'], amplitude=1.0 + q, center=0.0,
+                                sigma=s) for q, s in zip(q_values, sigmas)])
+    guesses = warm_start_guess(lorentzian_factory, ltz['x'], ys, q_values,
+                               n_clusters=2, seed=42)
+    assert len(guesses) == len(q_values)
+    assert_allclose([g['sigma'].value for g in guesses], sigmas, rtol=0.2)
+    results = fit_parallel(lorentzian_factory, ltz['x'], ys, q_values,
+                           guesses=guesses, n_workers=1)
+    assert_allclose([params['sigma'].value for params, _ in results],
+                    sigmas, rtol=1e-4)
+
+
+if __name__ == '__main__':
+    pytest.main([os.path.abspath(__file__)])
@@ -7,7 +7,9 @@ import numpy as np
 from numpy.testing import assert_almost_equal
 
 from lmfit.models import LorentzianModel, GaussianModel
-from qef.operators.convolve import Convolve
+from qef.models.tabulatedmodel import TabulatedModel
+from qef.models.teixeira import TeixeiraWaterModel
+from qef.operators.convolve import Convolve, convolve
 
 
 cases = ((LorentzianModel,
@@ -18,6 +20,67 @@ cases = ((LorentzianModel,
           lambda s1, s2: np.sqrt(s1 * s1 + s2 * s2)))
 
 
+def test_extended_energies():
+    c = Convolve(LorentzianModel(prefix='c1_'), GaussianModel(prefix='c2_'))
+    e = 0.1 * np.arange(-2, 4)
+    extended, de = c.extended_energies(e)
+    assert_almost_equal(extended, 0.1 * np.arange(-5, 6))
+    assert_almost_equal(de, 0.1)
+    # Same energies reuse the cached extension
+    assert c.extended_energies(e.copy())[0] is extended
+    # Different energies invalidate the cache
+    assert len(c.extended_energies(e[1:])[0]) == 9
+
+
+def test_fft_convolve():
+    c = Convolve(LorentzianModel(prefix='c1_'), GaussianModel(prefix='c2_'))
+    model_data = np.random.rand(301)
+    for res_data in (np.random.rand(101), np.random.rand(43)):
+        assert_almost_equal(c.fft_convolve(model_data, res_data),
+                            convolve(model_data, res_data))
+
+
+def test_eval_cache():
+    c = Convolve(LorentzianModel(prefix='c1_'), GaussianModel(prefix='c2_'))
+    p = c.make_params(c1_amplitude=1.0, c1_center=0.0, c1_sigma=0.1,
+                      c2_amplitude=1.0, c2_center=0.0, c2_sigma=0.2)
+    e = 0.01 * np.arange(-100, 100)
+    y = c.eval(params=p, x=e)
+    expected = y.copy()
+    assert not y.flags.writeable  # result is shared with the cache
+    evaluations = list()
+    c.model.func = lambda x, **kws: evaluations.append(x) or x * 0.0
+    assert_almost_equal(c.eval(params=p, x=e.copy()), expected)
+    assert len(evaluations) == 0  # cached
+    p['c2_sigma'].set(value=0.3)
+    c.eval(params=p, x=e)
+    assert len(evaluations) == 1  # parameters changed
+    c.eval(params=p, x=e, c2_sigma=0.4)
+    assert len(evaluations) == 2  # overrides bypass the cache
+
+    # changes of model options, not only of parameters, invalidate the cache
+    c = Convolve(GaussianModel(prefix='r_'), TeixeiraWaterModel(prefix='t_',
+                                                                q=0.3))
+    p = c.make_params(r_amplitude=1.0, r_center=0.0, r_sigma=0.01,
+                      t_amplitude=1.0, t_center=0.0, t_tau=1.0, t_dcf=1.0)
+    y = c.eval(params=p, x=e)
+    c.model.q = 1.5
+    assert not np.allclose(c.eval(params=p, x=e), y)
+    c.model.q = 0.3
+    assert_almost_equal(c.eval(params=p, x=e), y)
+
+    # tables shared with writable arrays may change in place
+    xs = 0.01 * np.arange(-100, 100)
+    ys = np.exp(-xs * xs / 0.02)
+    c = Convolve(GaussianModel(prefix='r_'),
+                 TabulatedModel(xs, ys, copy=False, prefix='t_'))
+    p = c.make_params(r_amplitude=1.0, r_center=0.0, r_sigma=0.01,
+                      t_amplitude=1.0, t_center=0.0)
+    y = c.eval(params=p, x=e)
+    ys *= 2.0
+    assert_almost_equal(c.eval(params=p, x=e), 2.0 * y)
+
+
 @pytest.mark.parametrize('ComponentModel, de, sigma', cases)
 def test_simplecases(ComponentModel, de, sigma):
     r"""Convolution of two Lorentzians is one Lorentzian, and convolution
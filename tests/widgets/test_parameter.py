@@ -4,18 +4,79 @@
 from __future__ import (absolute_import, division, print_function)
 
 import os
+import gc
+import copy
+import pickle
+import weakref
 import pytest
 import lmfit
 import ipywidgets as ipyw
 import qef.widgets.parameter as pqef
 
 
+class FakeCall(object):
+    r"""Scheduled call, carried out on demand instead of after a wait"""
+
+    def __init__(self, wait, func, *args, **kwargs):
+        self.wait = wait
+        self.call = lambda: func(*args, **kwargs)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_debounce():
+    calls = list()
+    scheduled = list()
+
+    def scheduler(wait, func, *args, **kwargs):
+        scheduled.append(FakeCall(wait, func, *args, **kwargs))
+        return scheduled[-1]
+
+    debounced = pqef.debounce(0.05, scheduler=scheduler)(calls.append)
+    for i in range(3):
+        debounced(i)
+    assert [c.wait for c in scheduled] == [0.05] * 3
+    assert [c.cancelled for c in scheduled] == [True, True, False]
+    for c in scheduled:
+        if not c.cancelled:
+            c.call()
+    assert calls == [2]  # only the last call of the burst
+
+
+def test_call_later():
+    # without a running event loop, a daemon timer does not block the exit
+    timer = pqef.call_later(60.0, list)
+    assert timer.daemon is True
+    timer.cancel()
+
+
 class TestParameterWidget(object):
 
     def test_init(self):
         p = pqef.ParameterWidget()
         assert p.nomin.value is True
         assert p.min.value == -float('inf')
+        assert p.value.continuous_update is False
+        p = pqef.ParameterWidget(continuous_update=True)
+        assert p.max.continuous_update is True
+
+    def test_shared(self):
+        p, q = pqef.ParameterWidget(), pqef.ParameterWidget()
+        assert p.header is q.header
+        assert p.min.layout is q.min.layout
+        assert pqef.ParameterWidget(show_header=False).header is None
+
+    def test_make_panel(self):
+        params = [pqef.ParameterWithTraits(name=n, value=v)
+                  for n, v in (('a', 1.0), ('b', 2.0))]
+        panel = pqef.ParameterWidget.make_panel(params)
+        header, wa, wb = panel.children
+        assert header is pqef.ParameterWidget.shared_header()
+        assert wa.header is None and wa.value.value == 1.0
+        params[1].value = 3.0
+        assert wb.value.value == 3.0
 
 
 def test_create_facade(widgets_fix):
@@ -49,58 +110,93 @@ def test_add_widget_callbacks(widgets_fix):
     pqef.add_widget_callbacks(p)
     for name in ('nomin', 'min', 'value', 'nomax', 'max', 'vary', 'expr'):
         assert hasattr(p, name + '_value_change') is True
+    # instances of the same widget type share the extended type
+    q = widgets_fix['CustomParm']()
+    q.facade = pqef.create_facade(q, mapping=widgets_fix['mapping'])
+    pqef.add_widget_callbacks(q)
+    assert type(q) is type(p)
+
+    # repeated registrations do not duplicate the callbacks
+    def n_observers(w):
+        return len(w._trait_notifiers.get('value', dict()).get('change', []))
+    n = n_observers(q.left)
+    pqef.add_widget_callbacks(q, mapping=widgets_fix['mapping'])
+    assert n_observers(q.left) == n
+    # closing removes the observers of the components
+    r = pqef.add_widget_facade(widgets_fix['CustomParm'](),
+                               mapping=widgets_fix['mapping'])
+    pqef.add_widget_callbacks(r)
+    r.close()
+    assert n_observers(r.left) == 0
+
+    # callbacks do not keep the widget alive
+    ref = weakref.ref(q)
+    gc.disable()
+    try:
+        q.close()
+        del q
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+inf = float('inf')
+
+#: Sequences of component values entered by the user, and the expected
+#: values of the components after the callbacks run
+callback_scenarios = (
+    # nomin notified of min change
+    ((('min', -1.0),), dict(nomin=False)),
+    # min notified of nomin change
+    ((('min', -1.0), ('nomin', True)), dict(min=-inf)),
+    # value not updated
+    ((('value', 0.5), ('min', 0.0)), dict(value=0.5)),
+    # value notified of min change
+    ((('value', 0.5), ('min', 1.0)), dict(value=1.0)),
+    # nomax notified of max change
+    ((('max', 10.0),), dict(nomax=False)),
+    # max notified of nomax change
+    ((('max', 10.0), ('nomax', True)), dict(max=inf)),
+    # value not updated
+    ((('min', -1.0), ('value', 0.0), ('max', 1.0)), dict(value=0.0)),
+    # value notified of max change
+    ((('min', -1.0), ('value', 0.0), ('max', -0.5)), dict(value=-0.5)),
+    # min value rejected
+    ((('min', -1.0), ('value', 0.0), ('max', 1.0), ('min', 2.0)),
+     dict(min=-1.0)),
+    # max value rejected
+    ((('min', -1.0), ('value', 0.0), ('max', 1.0), ('max', -2.0)),
+     dict(max=1.0)),
+    # value within bounds
+    ((('min', -1.0), ('value', -2.0)), dict(value=-1.0)),
+    ((('max', 1.0), ('value', 2.0)), dict(value=1.0)),
+)
 
 
 class TestParameterCallbacksMixin(object):
 
-    def test_callbacks(self, widgets_fix):
+    @pytest.fixture
+    def wired_parm(self, widgets_fix):
         p = widgets_fix['CustomParm']()
         p.facade = pqef.create_facade(p, mapping=widgets_fix['mapping'])
         pqef.add_widget_callbacks(p)
+        return p
+
+    @pytest.mark.parametrize('entered, expected', callback_scenarios)
+    def test_callbacks(self, wired_parm, entered, expected):
+        facade = wired_parm.facade
+        for name, value in entered:
+            facade[name].value = value
+        for name, value in expected.items():
+            assert facade[name].value == value
 
-        p.facade['min'].value = -1.0
-        assert p.facade['nomin'].value is False  # nomin notified of min change
-        p.facade['nomin'].value = True
-        # test min was notified of nomin change
-        assert p.facade['min'].value == -p.inf
-
-        p.facade['value'].value = 0.5
-        p.facade['min'].value = 0.0
-        assert p.facade['value'].value == 0.5  # value not updated
-        p.facade['min'].value = 1.0
-        # test value was notified of min change
-        assert p.facade['value'].value == p.facade['min'].value
-
-        p.facade['max'].value = 10.0
-        # test nomax was notified of max change
-        assert p.facade['nomax'].value is False
-        p.facade['nomax'].value = True
-        # test max was notified of nomax change
-        assert p.facade['max'].value == p.inf
-
-        p.facade['min'].value = -1.0
-        p.facade['value'].value = 0.0
-        p.facade['max'].value = 1.0
-        assert p.facade['value'].value == 0.0  # value not updated
-        p.facade['max'].value = -0.5
-        # test value was notified of max change
-        assert p.facade['value'].value == p.facade['max'].value
-
-        p.facade['min'].value = -1.0
-        p.facade['value'].value = 0.0
-        p.facade['max'].value = 1.0
-        p.facade['min'].value = p.facade['max'].value + 1.0
-        assert p.facade['min'].value == -1.0  # min value rejected
-        p.facade['max'].value = p.facade['min'].value - 1.0
-        assert p.facade['max'].value == 1.0  # max value rejected
-
-        # test value within bounds
-        p.facade['min'].value = -1.0
-        p.facade['value'].value = -2.0
-        assert p.facade['value'].value == p.facade['min'].value
-        p.facade['max'].value = 1.0
-        p.facade['value'].value = 2.0
-        assert p.facade['value'].value == p.facade['max'].value
+    def test_vary_callback(self, wired_parm):
+        facade = wired_parm.facade
+        # vary enables/disables the other components
+        facade['vary'].value = False
+        assert facade['min'].disabled is True
+        facade['vary'].value = True
+        assert facade['value'].disabled is False
 
 
 class TestParameterWithTraits(object):
@@ -114,6 +210,14 @@ class TestParameterWithTraits(object):
         r = "<ParameterWithTraits <Parameter 'p', 24, bounds=[-inf:inf]>>"
         assert repr(p) == r
 
+    def test_name_translation(self):
+        pwt = pqef.ParameterWithTraits
+        assert pwt.feature_to_trait('value') == 'tvalue'
+        assert pwt.attr_to_trait('_expr') == 'texpr'
+        assert pwt.trait_to_attr('tmin') == 'min'
+        with pytest.raises(KeyError):
+            pwt.trait_to_attr('min')
+
     def test_setattr(self):
         p = pqef.ParameterWithTraits(name='p', value=24)
         assert p.value == 24
@@ -124,6 +228,12 @@ class TestParameterWithTraits(object):
         assert p.tvalue == 24
         assert p.value == 24
 
+    def test_copy(self):
+        p = pqef.ParameterWithTraits(name='p', value=24)
+        for q in (copy.deepcopy(p), pickle.loads(pickle.dumps(p))):
+            q.value = 42
+            assert q.tvalue == 42 and p.tvalue == 24
+
     def test_set(self):
         p = lmfit.Parameter(name='p')
         p.set(expr='hello')
@@ -137,11 +247,50 @@ class TestParameterWithTraits(object):
         p.set(value=42)
         assert p.tvalue == 42 and p.vary is False
         assert p._expr is None and p.texpr is None
+        # observers see the parameter after all attributes are set
+        seen = list()
+        p.observe(lambda change: seen.append((p.tmin, p.value)), 'tvalue')
+        p.set(value=5.0, min=1.0)
+        assert seen == [(1.0, 5.0)]
+
+    def test_texpr(self):
+        params = lmfit.Parameters()
+        params.add('a', value=3.0)
+        params.add(pqef.ParameterWithTraits(name='b', value=1.0))
+        b = params['b']
+        b.expr = '2*a'
+        assert b.value == 6.0
+        b.texpr = '5*a'  # e.g. edited in a linked widget
+        assert b.expr == '5*a' and b.value == 15.0
 
     def test_link_widget(self):
         p = pqef.ParameterWithTraits(name='p', value=24)
         w = ipyw.FloatSlider()
         p.link_widget(w)
+        p.link_widget(w)  # already linked
+        assert len(p._widget_links) == 1
+        # repeated linking does not duplicate the callbacks
+        w = pqef.ParameterWidget()
+        calls = list()
+        w.min_value_change = lambda change: calls.append(change.new)
+        for _ in range(3):
+            p.link_widget(w, mapping=dict(min='min', value='value'))
+        w.min.value = -1.0
+        assert calls == [-1.0]
+        # changes cascading among linked widgets reach the parameter
+        p = pqef.ParameterWithTraits(name='p', value=0.0)
+        w = pqef.ParameterWidget()
+        p.link_widget(w, mapping=dict(min='min', value='value', max='max'))
+        p.min = 5.0
+        assert w.value.value == 5.0 and p.value == 5.0
+        # display-only widget
+        p = pqef.ParameterWithTraits(name='p', value=24)
+        w = ipyw.FloatText()
+        p.link_widget(w, read_only=True)
+        p.value = 42
+        assert w.value == 42
+        w.value = 24
+        assert p.value == 42
 
 
 if __name__ == '__main__':